@@ -0,0 +1,100 @@
+import asyncio
+
+import pytest
+
+from yenta import discovery
+from yenta.discovery import MCPDiscovery
+
+
+class CountingDiscovery(MCPDiscovery):
+    """Stands in for a server round trip; counts calls and can be held open"""
+
+    def __init__(self, server_path, delay=0.0, fail=False):
+        super().__init__(server_path)
+        self.calls = 0
+        self.delay = delay
+        self.fail = fail
+
+    async def _discover_uncached(self):
+        self.calls += 1
+        await asyncio.sleep(self.delay)
+        if self.fail:
+            raise ConnectionError("server down")
+        return {"tools": [{"name": "ping"}], "prompts": [], "resources": []}
+
+
+@pytest.fixture(autouse=True)
+def fresh_cache(monkeypatch):
+    monkeypatch.setattr(discovery, "FASTMCP_AVAILABLE", True)
+    MCPDiscovery.invalidate()
+    yield
+    MCPDiscovery.invalidate()
+
+
+def test_result_is_reused_across_event_loops():
+    disc = CountingDiscovery("http://server")
+
+    assert asyncio.run(disc.discover_all())["tools"] == [{"name": "ping"}]
+    assert asyncio.run(disc.discover_all())["tools"] == [{"name": "ping"}]
+    assert disc.calls == 1
+
+
+def test_concurrent_callers_share_one_discovery():
+    disc = CountingDiscovery("http://server", delay=0.01)
+
+    async def main():
+        return await asyncio.gather(*(disc.discover_all() for _ in range(5)))
+
+    results = asyncio.run(main())
+    assert disc.calls == 1
+    assert all(result["tools"] == [{"name": "ping"}] for result in results)
+
+
+def test_discovery_left_pending_by_a_finished_loop_does_not_hang_the_next():
+    disc = CountingDiscovery("http://server", delay=0.05)
+
+    async def give_up():
+        with pytest.raises(asyncio.TimeoutError):
+            await asyncio.wait_for(disc.discover_all(), 0.001)
+
+    asyncio.run(give_up())
+    # The loop's shutdown cancelled the discovery and dropped its entry
+    assert not discovery._IN_FLIGHT
+
+    disc.delay = 0.0
+    result = asyncio.run(asyncio.wait_for(disc.discover_all(), 1))
+    assert result["tools"] == [{"name": "ping"}]
+
+
+def test_cancelled_caller_does_not_cancel_other_waiters():
+    disc = CountingDiscovery("http://server", delay=0.02)
+
+    async def main():
+        owner = asyncio.ensure_future(disc.discover_all())
+        await asyncio.sleep(0)
+        waiter = asyncio.ensure_future(disc.discover_all())
+        await asyncio.sleep(0)
+        owner.cancel()
+        return await waiter
+
+    assert asyncio.run(main())["tools"] == [{"name": "ping"}]
+    assert disc.calls == 1
+
+
+def test_failures_are_not_cached():
+    disc = CountingDiscovery("http://server", fail=True)
+
+    with pytest.raises(ConnectionError):
+        asyncio.run(disc.discover_all())
+
+    disc.fail = False
+    assert asyncio.run(disc.discover_all())["tools"] == [{"name": "ping"}]
+    assert disc.calls == 2
+
+
+def test_callers_get_their_own_lists():
+    disc = CountingDiscovery("http://server")
+
+    asyncio.run(disc.discover_all())["tools"].clear()
+
+    assert asyncio.run(disc.discover_all())["tools"] == [{"name": "ping"}]
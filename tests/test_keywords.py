@@ -0,0 +1,70 @@
+from types import SimpleNamespace
+
+import pytest
+
+pytest.importorskip("agora")
+
+from yenta import nodes
+from yenta.nodes import SMALL_KEYWORD_SET, RunMCPTestsNode
+
+RESPONSE = {"status": "ok", "items": [{"title": "Déjà Vu"}, {"title": "Ünïcode"}], "count": 2}
+
+
+def keyword_test(*keywords):
+    return SimpleNamespace(expected_keywords=list(keywords), lowered_keywords=tuple(k.lower() for k in keywords))
+
+
+def runner():
+    node = RunMCPTestsNode.__new__(RunMCPTestsNode)
+    node._keyword_automata = {}
+    return node
+
+
+def many_keywords(*extra):
+    # Enough keywords to take the automaton path
+    filler = [f"absent-{i}" for i in range(SMALL_KEYWORD_SET)]
+    return keyword_test(*filler, *extra)
+
+
+@pytest.fixture(params=["substring", "automaton"])
+def matcher(request, monkeypatch):
+    if request.param == "automaton":
+        pytest.importorskip("ahocorasick")
+    else:
+        monkeypatch.setattr(nodes, "AHOCORASICK_AVAILABLE", False)
+    return runner()
+
+
+def test_keywords_match_case_insensitively_against_the_json_text(matcher):
+    test = many_keywords("STATUS", 'status": "ok', "déjà vu", "ÜNÏCODE", "count", "missing", "")
+
+    missing = matcher._missing_keywords(RESPONSE, test)
+
+    # Keywords are reported as written in the spec
+    assert missing == [f"absent-{i}" for i in range(SMALL_KEYWORD_SET)] + ["missing"]
+
+
+def test_overlapping_and_nested_keywords_are_all_found(matcher):
+    test = many_keywords("title", "tit", "itle", "le\": \"déjà", "ok\"")
+
+    assert matcher._missing_keywords(RESPONSE, test) == [f"absent-{i}" for i in range(SMALL_KEYWORD_SET)]
+
+
+def test_small_keyword_sets_use_plain_substring_checks():
+    node = runner()
+    test = keyword_test("ok", "nope")
+
+    assert node._missing_keywords(RESPONSE, test) == ["nope"]
+    assert node._keyword_automata == {}
+
+
+def test_automaton_is_built_once_per_keyword_set():
+    pytest.importorskip("ahocorasick")
+    node = runner()
+    test = many_keywords("status")
+
+    node._missing_keywords(RESPONSE, test)
+    automaton = node._keyword_automata[test.lowered_keywords]
+    node._missing_keywords({"other": "status"}, test)
+
+    assert node._keyword_automata == {test.lowered_keywords: automaton}
@@ -0,0 +1,92 @@
+import json
+import os
+import stat
+
+import pytest
+
+from yenta.mocks import MockRegistry
+
+
+def test_record_writes_flat_mocks_json(tmp_path):
+    mock_file = tmp_path / "mocks.json"
+    registry = MockRegistry(str(mock_file))
+
+    registry.record("search", {"q": "a"}, {"hits": 1})
+    registry.record("search", {"q": "b"}, {"hits": 1})
+
+    # Older installs and external tools read mocks.json as {key: response}
+    on_disk = json.loads(mock_file.read_text())
+    assert on_disk == {
+        registry.get_mock_key("search", {"q": "a"}): {"hits": 1},
+        registry.get_mock_key("search", {"q": "b"}): {"hits": 1},
+    }
+
+
+def test_recorded_mocks_replay_after_reload(tmp_path):
+    mock_file = tmp_path / "mocks.json"
+    MockRegistry(str(mock_file)).record("fetch", {"url": "x", "limit": 2}, {"body": "ok"})
+
+    registry = MockRegistry(str(mock_file))
+
+    # Key text is order-independent in args
+    assert registry.get("fetch", {"limit": 2, "url": "x"}) == {"body": "ok"}
+    assert registry.has_mock("fetch", {"url": "x", "limit": 2})
+    assert registry.get("fetch", {"url": "y"}) is None
+
+
+def test_flat_file_from_older_version_loads(tmp_path):
+    mock_file = tmp_path / "mocks.json"
+    key = json.dumps({"tool": "ping", "args": {}}, sort_keys=True)
+    mock_file.write_text(json.dumps({key: {"pong": True}}))
+
+    assert MockRegistry(str(mock_file)).get("ping", {}) == {"pong": True}
+
+
+def test_batch_defers_the_write_to_the_end(tmp_path):
+    mock_file = tmp_path / "mocks.json"
+    registry = MockRegistry(str(mock_file))
+
+    with registry.batch():
+        registry.record("a", {}, {"n": 1})
+        registry.record("b", {}, {"n": 2})
+        assert not mock_file.exists()
+
+    assert len(json.loads(mock_file.read_text())) == 2
+
+
+def test_save_keeps_the_existing_file_mode(tmp_path):
+    mock_file = tmp_path / "mocks.json"
+    mock_file.write_text("{}")
+    mock_file.chmod(0o664)
+
+    MockRegistry(str(mock_file)).record("a", {}, {"n": 1})
+
+    assert stat.S_IMODE(mock_file.stat().st_mode) == 0o664
+
+
+def test_new_file_gets_the_umask_mode_not_mkstemp_0600(tmp_path):
+    mock_file = tmp_path / "mocks.json"
+    old_umask = os.umask(0o022)
+    try:
+        MockRegistry(str(mock_file)).record("a", {}, {"n": 1})
+    finally:
+        os.umask(old_umask)
+
+    assert stat.S_IMODE(mock_file.stat().st_mode) == 0o644
+
+
+def test_failed_save_leaves_mocks_json_and_no_temp_file(tmp_path, monkeypatch):
+    mock_file = tmp_path / "mocks.json"
+    registry = MockRegistry(str(mock_file))
+    registry.record("a", {}, {"n": 1})
+    before = mock_file.read_bytes()
+
+    def fail_replace(src, dst):
+        raise OSError("disk full")
+
+    monkeypatch.setattr(os, "replace", fail_replace)
+    with pytest.raises(OSError):
+        registry.record("b", {}, {"n": 2})
+
+    assert mock_file.read_bytes() == before
+    assert sorted(p.name for p in tmp_path.iterdir()) == ["mocks.json"]
@@ -0,0 +1,149 @@
+import json
+import os
+
+import pytest
+
+from yenta import models
+from yenta.registry import JsonRegistry
+
+
+@pytest.fixture
+def registry(tmp_path, monkeypatch):
+    # The legacy mocks.json migration looks in the working directory
+    monkeypatch.chdir(tmp_path)
+    return JsonRegistry(str(tmp_path / "data"))
+
+
+def make_run(session_id, spec_name="spec.yaml"):
+    return models.TestRun(session_id=session_id, spec_name=spec_name, server="server.py",
+                          status="completed", duration_ms=1.0, results=[])
+
+
+def run_dir_names(registry):
+    return sorted(p.name for p in registry.runs_dir.iterdir())
+
+
+def mock_path(registry, category, tool, args):
+    key = registry._get_mock_key(category, tool, args)
+    return registry.data_dir / registry.index[key]
+
+
+def test_replayed_responses_are_copies(registry):
+    response = {"items": [1, 2]}
+    registry.save_mock("tools", "list", {}, response)
+
+    # Changing the recorded dict after saving does not change the replay
+    response["items"].append(3)
+    first = registry.load_mock("tools", "list", {})
+    assert first == {"items": [1, 2]}
+
+    # Neither does changing a replayed response
+    first["items"].append(4)
+    assert registry.load_mock("tools", "list", {}) == {"items": [1, 2]}
+
+
+def test_cached_mock_stops_replaying_once_its_file_is_deleted(registry):
+    registry.save_mock("tools", "ping", {}, {"pong": True})
+    assert registry.load_mock("tools", "ping", {}) == {"pong": True}
+
+    os.unlink(mock_path(registry, "tools", "ping", {}))
+
+    assert registry.load_mock("tools", "ping", {}) is None
+
+
+def test_cached_mock_stops_replaying_once_its_index_row_is_gone(registry):
+    registry.save_mock("tools", "ping", {}, {"pong": True})
+    assert registry.load_mock("tools", "ping", {}) == {"pong": True}
+
+    # Another process clearing the category removes the index rows
+    JsonRegistry(str(registry.data_dir)).clear_mocks("tools")
+
+    assert registry.load_mock("tools", "ping", {}) is None
+
+
+def test_pre_sqlite_index_json_is_imported_once(registry):
+    registry.save_mock("tools", "ping", {"n": 1}, {"pong": True})
+    key = registry._get_mock_key("tools", "ping", {"n": 1})
+    entries = {key: registry.index[key]}
+    registry.index.close()
+
+    # Rebuild the layout an older version left behind: index.json, no index.db
+    for db_file in registry.mocks_dir.glob("index.db*"):
+        db_file.unlink()
+    (registry.mocks_dir / "index.json").write_text(json.dumps(entries))
+
+    migrated = JsonRegistry(str(registry.data_dir))
+
+    assert migrated.load_mock("tools", "ping", {"n": 1}) == {"pong": True}
+    assert not (registry.mocks_dir / "index.json").exists()
+    assert json.loads((registry.mocks_dir / "index.json.old").read_text()) == entries
+
+
+def test_unreadable_index_json_is_set_aside(registry):
+    registry.index.close()
+    (registry.mocks_dir / "index.json").write_text("{not json")
+
+    migrated = JsonRegistry(str(registry.data_dir))
+
+    assert len(migrated.index) == 0
+    assert (registry.mocks_dir / "index.json.old").exists()
+
+
+def test_latest_json_points_at_the_newest_run(registry, capsys):
+    registry.save_run(make_run("first", "a.yaml"))
+    registry.save_run(make_run("second", "b.yaml"))
+
+    assert registry.load_latest_run().session_id == "second"
+    # Only the two runs and the pointer: no temp files left behind
+    names = run_dir_names(registry)
+    assert len(names) == 3 and "latest.json" in names
+    assert not any(name.endswith(".tmp") for name in names)
+
+
+def test_latest_json_is_a_copy_without_symlink_support(registry, monkeypatch, capsys):
+    def no_symlinks(src, dst):
+        raise OSError("symlinks not permitted")
+
+    monkeypatch.setattr(os, "symlink", no_symlinks)
+    registry.save_run(make_run("copied"))
+
+    latest = registry.runs_dir / "latest.json"
+    assert not latest.is_symlink()
+    assert registry.load_latest_run().session_id == "copied"
+
+
+def test_failed_swap_keeps_the_old_latest_json_and_no_temp_file(registry, monkeypatch, capsys):
+    registry.save_run(make_run("kept", "a.yaml"))
+
+    def fail_replace(src, dst):
+        raise OSError("disk full")
+
+    monkeypatch.setattr(os, "replace", fail_replace)
+    with pytest.raises(OSError):
+        registry.save_run(make_run("lost", "b.yaml"))
+
+    assert registry.load_latest_run().session_id == "kept"
+    assert not any(name.endswith(".tmp") for name in run_dir_names(registry))
+
+
+def test_batch_writes_mock_files_as_it_goes_and_commits_the_index(registry):
+    with registry.batch():
+        registry.save_mock("tools", "a", {}, {"n": 1})
+        assert mock_path(registry, "tools", "a", {}).exists()
+        registry.save_mock("tools", "b", {}, {"n": 2})
+
+    reopened = JsonRegistry(str(registry.data_dir))
+    assert reopened.load_mock("tools", "a", {}) == {"n": 1}
+    assert reopened.load_mock("tools", "b", {}) == {"n": 2}
+
+
+def test_failed_batch_rolls_back_its_index_rows(registry):
+    registry.save_mock("tools", "kept", {}, {"n": 0})
+
+    with pytest.raises(RuntimeError):
+        with registry.batch():
+            registry.save_mock("tools", "lost", {}, {"n": 1})
+            raise RuntimeError("recording aborted")
+
+    assert registry.load_mock("tools", "lost", {}) is None
+    assert registry.load_mock("tools", "kept", {}) == {"n": 0}
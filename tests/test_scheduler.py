@@ -0,0 +1,96 @@
+import asyncio
+
+import pytest
+
+pytest.importorskip("agora")
+
+from yenta._scheduler import build_dependencies, needs_layered_run, run_layers
+from yenta.parser import WorkflowParser
+from yenta.workflow_flow import MCPWorkflowFlow
+from yenta.workflow_nodes import PREV_OUTPUT_KEY
+
+
+class StubNode:
+    """Writes `<name>_output` from the output its predecessor pointer names"""
+
+    def __init__(self, name, log, delay=0.0):
+        self.name = name
+        self.params = {}
+        self.log = log
+        self.delay = delay
+
+    def set_params(self, params):
+        self.params = params
+
+    async def _run_async(self, shared):
+        self.log.append(("start", self.name, dict(self.params)))
+        await asyncio.sleep(self.delay)
+        prev_key = shared.get(PREV_OUTPUT_KEY)
+        shared[f"{self.name}_output"] = {"from": shared.get(prev_key) if prev_key else None, "by": self.name}
+        self.log.append(("end", self.name))
+
+
+def stub_nodes(names, log, **delays):
+    return {name: StubNode(name, log, delays.get(name, 0.0)) for name in names}
+
+
+def connections(*lines):
+    return WorkflowParser.parse_workflow(list(lines))
+
+
+def test_only_branching_acyclic_unconditional_workflows_are_layered():
+    assert needs_layered_run(connections("fetch >> summarize", "fetch >> links"))
+    assert not needs_layered_run(connections("a >> b", "b >> c"))
+    assert not needs_layered_run(connections("a - 'ok' >> b", "a - 'retry' >> c"))
+    assert not needs_layered_run(connections("a >> b", "a >> c", "c >> a"))
+
+
+def test_branches_of_one_layer_run_concurrently_and_merge_back():
+    log = []
+    conns = connections("fetch >> summarize", "fetch >> links", "summarize >> report", "links >> report")
+    deps = build_dependencies(conns)
+    nodes = stub_nodes(["fetch", "summarize", "links", "report"], log, summarize=0.02)
+
+    shared = asyncio.run(run_layers(nodes, deps, {"seed": 1}))
+
+    # links starts before the slower summarize finishes
+    order = [(event, name) for event, name, *_ in log]
+    assert order.index(("start", "links")) < order.index(("end", "summarize"))
+    assert order.index(("end", "links")) < order.index(("start", "report"))
+
+    assert shared["seed"] == 1
+    assert shared["summarize_output"]["from"] == shared["fetch_output"]
+    assert shared["links_output"]["from"] == shared["fetch_output"]
+    # A join reads the output of its last declared predecessor
+    assert shared["report_output"]["from"] == shared["links_output"]
+
+
+def test_every_node_run_gets_the_params_on_a_copy():
+    log = []
+    deps = build_dependencies(connections("a >> b", "a >> c"))
+    nodes = stub_nodes(["a", "b", "c"], log)
+
+    asyncio.run(run_layers(nodes, deps, {}, {"limit": 3}))
+
+    starts = [entry for entry in log if entry[0] == "start"]
+    assert {name for _, name, _ in starts} == {"a", "b", "c"}
+    assert all(params == {"limit": 3} for _, _, params in starts)
+    # The flow's own node objects are left untouched, as with Agora's orchestrator
+    assert all(node.params == {} for node in nodes.values())
+
+
+def test_layered_flow_passes_params_through_orch_async():
+    log = []
+    flow = MCPWorkflowFlow.__new__(MCPWorkflowFlow)
+    flow.params = {"mode": "flow"}
+    flow.dependencies = build_dependencies(connections("a >> b", "a >> c"))
+    flow.nodes = stub_nodes(["a", "b", "c"], log)
+
+    shared = {}
+    asyncio.run(flow._orch_async(shared))
+    assert {params["mode"] for _, _, params in (e for e in log if e[0] == "start")} == {"flow"}
+    assert {"a_output", "b_output", "c_output"} <= shared.keys()
+
+    log.clear()
+    asyncio.run(flow._orch_async({}, {"mode": "override"}))
+    assert {params["mode"] for _, _, params in (e for e in log if e[0] == "start")} == {"override"}
@@ -0,0 +1,46 @@
+"""
+Location and write helpers for Yenta's on-disk caches.
+
+Caches live in the per-user cache directory ($XDG_CACHE_HOME/yenta or
+~/.cache/yenta; %LOCALAPPDATA%\\yenta\\Cache on Windows), never in the project
+tree, so a checked-out repository cannot plant entries that Yenta later loads.
+"""
+import os
+import sys
+import tempfile
+from pathlib import Path
+
+
+def user_cache_dir(*parts: str) -> Path:
+    """
+    Path of a cache subdirectory for the current user (not created).
+
+    Args:
+        *parts: Subdirectory names, e.g. user_cache_dir("yaml")
+    """
+    if sys.platform == "win32" and os.environ.get("LOCALAPPDATA"):
+        root = Path(os.environ["LOCALAPPDATA"]) / "yenta" / "Cache"
+    else:
+        root = Path(os.environ.get("XDG_CACHE_HOME") or Path.home() / ".cache") / "yenta"
+    return root.joinpath(*parts)
+
+
+def atomic_write_bytes(path: Path, data: bytes):
+    """
+    Write a cache file through a unique temp file and os.replace.
+
+    Concurrent writers (e.g. discovery worker processes) each rename a complete
+    file into place, so readers never see a partially written entry.
+    """
+    path.parent.mkdir(mode=0o700, parents=True, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+    except BaseException:
+        try:
+            os.unlink(tmp_path)
+        except OSError:
+            pass
+        raise
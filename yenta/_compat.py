@@ -0,0 +1,7 @@
+"""
+Python-version shims shared across Yenta modules.
+"""
+import sys
+
+# dataclass(slots=True) needs Python 3.10+; older interpreters keep a regular __dict__
+DATACLASS_SLOTS = {"slots": True} if sys.version_info >= (3, 10) else {}
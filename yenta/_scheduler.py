@@ -0,0 +1,139 @@
+"""
+Layered scheduler for workflows with independent branches.
+
+Agora's flow routing follows exactly one successor per node, so a workflow like
+
+    fetch >> summarize
+    fetch >> extract_links
+
+would serialize (or drop) one of the branches. For unconditional workflows that
+form a DAG, the scheduler runs every node whose predecessors have finished
+together with asyncio.gather, one readiness layer at a time.
+
+Each node runs against a private copy of the shared dict with `_prev_output_key`
+pointed at its own predecessor, so parallel writers never race on that pointer.
+Every key a node set or removed is merged back after the layer completes.
+
+The copies are shallow: values are shared between the nodes of a layer. Nodes
+must store new values (shared[key] = ...) rather than mutate a shared list or
+dict in place, or parallel nodes race on that object.
+"""
+import asyncio
+import copy
+from graphlib import CycleError, TopologicalSorter
+from typing import Any, Dict, List, Optional, Tuple
+
+from yenta.workflow_nodes import PREV_OUTPUT_KEY
+
+_MISSING = object()
+
+Connection = Tuple[str, Optional[str], str, Optional[List[str]]]
+
+
+def build_dependencies(connections: List[Connection]) -> Dict[str, List[str]]:
+    """
+    Map each node to its predecessors, in the order they were declared.
+
+    Args:
+        connections: Output of WorkflowParser.parse_workflow
+
+    Returns:
+        Dict of node name -> list of predecessor names
+    """
+    deps: Dict[str, List[str]] = {}
+    for source, _, target, _ in connections:
+        deps.setdefault(source, [])
+        if target != "complete":
+            preds = deps.setdefault(target, [])
+            if source not in preds:
+                preds.append(source)
+    return deps
+
+
+def needs_layered_run(connections: List[Connection]) -> bool:
+    """
+    True when a workflow has independent branches that the layered scheduler can run.
+
+    Conditional (`- 'action' >>`) edges pick a single route at runtime and stay on
+    Agora's router, as do cyclic workflows (e.g. retry loops).
+    """
+    if any(action for _, action, _, _ in connections):
+        return False
+
+    successors: Dict[str, set] = {}
+    for source, _, target, _ in connections:
+        if target != "complete":
+            successors.setdefault(source, set()).add(target)
+
+    deps = build_dependencies(connections)
+    roots = [n for n, preds in deps.items() if not preds]
+    if len(roots) < 2 and all(len(targets) < 2 for targets in successors.values()):
+        return False
+
+    try:
+        TopologicalSorter(deps).prepare()
+    except CycleError:
+        return False
+    return True
+
+
+async def run_layers(
+    nodes: Dict[str, Any],
+    deps: Dict[str, List[str]],
+    shared: Dict[str, Any],
+    params: Optional[Dict[str, Any]] = None
+) -> Dict[str, Any]:
+    """
+    Run nodes layer by layer, gathering every ready node concurrently.
+
+    A node with several predecessors (a join) reads the output of the last one
+    declared. Layers are strictly sequential: the next ready set is only taken
+    after the whole current layer has finished, so no node runs twice. When two
+    nodes of one layer write the same key, the later one in the layer wins.
+
+    As in the flow's own orchestrator, each run uses a copy of the node with
+    the flow params set, driven through `_run_async` so it does not follow its
+    `>>` successors.
+
+    Args:
+        nodes: Node name -> Agora node
+        deps: Output of build_dependencies
+        shared: Shared store; receives every key the nodes write. Values are
+            shared between the nodes of a layer and must not be mutated in place
+        params: Flow params passed to every node
+
+    Returns:
+        The shared store
+    """
+    sorter = TopologicalSorter(deps)
+    sorter.prepare()
+
+    while sorter.is_active():
+        ready = sorter.get_ready()
+
+        base = dict(shared)
+        views = []
+        for name in ready:
+            view = dict(base)
+            preds = deps[name]
+            view[PREV_OUTPUT_KEY] = f"{preds[-1]}_output" if preds else None
+            views.append(view)
+
+        runs = []
+        for name, view in zip(ready, views):
+            node = copy.copy(nodes[name])
+            node.set_params(params or {})
+            runs.append(node._run_async(view))
+        await asyncio.gather(*runs)
+
+        for name, view in zip(ready, views):
+            for key, value in view.items():
+                if base.get(key, _MISSING) is not value:
+                    shared[key] = value
+            for key in base.keys() - view.keys():
+                shared.pop(key, None)
+            shared[PREV_OUTPUT_KEY] = f"{name}_output"
+
+        sorter.done(*ready)
+
+    return shared
@@ -6,14 +6,30 @@ and builds a registry of available MCP entities with their schemas.
 """
 
 import ast
+import hashlib
 import inspect
 import importlib.util
+import marshal
+import os
+import sys
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
-from typing import Dict, List, Any, Optional, Type
-from dataclasses import dataclass
+from typing import Dict, List, Any, Optional, Tuple, Type, Union
+from dataclasses import dataclass, fields
 
+from yenta._cache import atomic_write_bytes, user_cache_dir
+from yenta._compat import DATACLASS_SLOTS
 
-@dataclass
+try:
+    import xxhash
+    XXHASH_AVAILABLE = True
+except ImportError:
+    XXHASH_AVAILABLE = False
+    xxhash = None
+
+
+@dataclass(**DATACLASS_SLOTS)
 class MCPEntity:
     """Represents a discovered MCP entity (tool/prompt/resource)"""
     name: str
@@ -27,18 +43,18 @@ class MCPEntity:
 class MCPRegistry:
     """Registry of discovered MCP entities"""
     
+    # entity.category -> by_category key
+    _PLURAL = {"tool": "tools", "prompt": "prompts", "resource": "resources"}
+    
     def __init__(self):
         self.entities: Dict[str, MCPEntity] = {}  # name -> entity
-        self.by_category: Dict[str, List[MCPEntity]] = {
-            "tools": [],
-            "prompts": [],
-            "resources": []
-        }
+        self.by_category: Dict[str, List[MCPEntity]] = defaultdict(list)
     
     def register(self, entity: MCPEntity):
         """Register an MCP entity"""
         self.entities[entity.name] = entity
-        self.by_category[entity.category + "s"].append(entity)
+        category = entity.category
+        self.by_category[self._PLURAL.get(category) or category + "s"].append(entity)
     
     def get(self, name: str) -> Optional[MCPEntity]:
         """Get entity by name"""
@@ -50,70 +66,225 @@ class MCPRegistry:
     
     def list_by_category(self, category: str) -> List[MCPEntity]:
         """List entities by category (tools/prompts/resources)"""
-        return self.by_category.get(category, [])
+        return self.by_category.get(category) or []
     
     def exists(self, name: str) -> bool:
         """Check if entity exists"""
         return name in self.entities
 
 
+# Discovery results keyed by (absolute path, mtime_ns, size); persisted under AST_CACHE_DIR.
+# marshal is only trusted because the directory is per-user, outside any project tree.
+AST_CACHE_DIR = user_cache_dir("ast")
+_AST_CACHE: Dict[Tuple[str, int, int], List[MCPEntity]] = {}
+
+# Bump when the on-disk record layout or MCPEntity fields change
+_AST_CACHE_VERSION = 2
+_ENTITY_FIELDS = tuple(f.name for f in fields(MCPEntity))
+
+
+def _source_digest(source: bytes) -> str:
+    """64-bit content hash of a source file (xxh3 when available, else blake2b)"""
+    if XXHASH_AVAILABLE:
+        return xxhash.xxh3_64_hexdigest(source)
+    return hashlib.blake2b(source, digest_size=8).hexdigest()
+
+
+def _entity_to_tuple(entity: MCPEntity) -> tuple:
+    """Flatten an entity into a marshal-friendly tuple (field order of MCPEntity)"""
+    return tuple(getattr(entity, name) for name in _ENTITY_FIELDS)
+
+
+def _entity_from_tuple(values: tuple) -> MCPEntity:
+    """Inverse of _entity_to_tuple"""
+    return MCPEntity(*values)
+
+# Statement-list fields that can hold decorated functions (expressions are never visited)
+_STATEMENT_BLOCKS = ("body", "orelse", "finalbody", "handlers", "cases")
+
+# Decorator attribute name -> interned category (@mcp.tool(), @mcp.prompt(), @mcp.resource())
+_CATEGORY_MAP = {name: sys.intern(name) for name in ("tool", "prompt", "resource")}
+
+# Interned forms of the annotation strings most parameters share
+_COMMON_TYPES = {
+    t: sys.intern(t)
+    for t in ("str", "int", "float", "bool", "dict", "list", "any", "None")
+}
+
+
+# Constant types whose repr() matches ast.unparse output (floats differ for inf/nan)
+_REPR_CONSTANTS = (str, int, bool, type(None))
+
+
+def _unparse(node: ast.AST) -> str:
+    """
+    ast.unparse with fast paths for the common annotation and default shapes:
+    bare names (str, int, dict, ...) and simple literals ("", 10, True, None).
+    """
+    node_type = type(node)
+    if node_type is ast.Name:
+        return node.id
+    if node_type is ast.Constant and type(node.value) in _REPR_CONSTANTS:
+        return repr(node.value)
+    return ast.unparse(node)
+
+
 class ASTDiscovery:
     """Discover MCP entities using AST parsing (without importing)"""
-    
+
     @staticmethod
     def discover_from_file(filepath: str) -> List[MCPEntity]:
         """
         Parse Python file and extract @mcp.tool/@mcp.prompt/@mcp.resource decorators.
-        
+
+        Results are cached in memory and on disk. A changed mtime or size only
+        triggers a re-parse if the source content hash changed too.
+
         Example FastMCP file:
             @mcp.tool()
             def search_docs(query: str) -> dict:
                 '''Search documentation'''
                 return {"results": [...]}
-        
+
         Returns:
             List of MCPEntity objects
         """
+        abspath = os.path.abspath(filepath)
+        st = os.stat(abspath)
+        key = (abspath, st.st_mtime_ns, st.st_size)
+
+        entities = _AST_CACHE.get(key)
+        if entities is None:
+            stat_key = (st.st_mtime_ns, st.st_size)
+            cache_file = AST_CACHE_DIR / f"{hashlib.sha1(abspath.encode()).hexdigest()}.marshal"
+            cached = ASTDiscovery._load_cached(cache_file)
+            
+            if cached is not None and cached[0] == stat_key:
+                entities = cached[2]
+            else:
+                # Raw bytes let the parser handle decoding (and PEP 263 coding cookies) itself
+                with open(abspath, 'rb') as f:
+                    source = f.read()
+                digest = _source_digest(source)
+                if cached is not None and cached[1] == digest:
+                    entities = cached[2]
+                else:
+                    entities = ASTDiscovery._parse_source(source, filepath)
+                ASTDiscovery._store_cached(cache_file, stat_key, digest, entities)
+            _AST_CACHE[key] = entities
+
+        return list(entities)
+
+    @staticmethod
+    def _load_cached(cache_file: Path) -> Optional[Tuple[Tuple[int, int], str, List[MCPEntity]]]:
+        """Load (stat key, source digest, entities) from the disk cache, or None if absent/stale"""
+        try:
+            with open(cache_file, 'rb') as f:
+                version, stat_key, digest, records = marshal.load(f)
+        except Exception:
+            return None
+        if version != _AST_CACHE_VERSION:
+            return None
+        try:
+            entities = [_entity_from_tuple(record) for record in records]
+        except TypeError:
+            return None
+        return tuple(stat_key), digest, entities
+
+    @staticmethod
+    def _store_cached(cache_file: Path, stat_key: Tuple[int, int], digest: str, entities: List[MCPEntity]):
+        """Write entities to the disk cache (best effort)"""
+        record = (_AST_CACHE_VERSION, stat_key, digest, [_entity_to_tuple(e) for e in entities])
+        try:
+            atomic_write_bytes(cache_file, marshal.dumps(record))
+        except (OSError, ValueError):
+            pass
+
+    @staticmethod
+    def _parse_source(source: bytes, filepath: str) -> List[MCPEntity]:
+        """Parse source bytes and extract their MCP entities (uncached)"""
         entities = []
+
+        tree = ast.parse(source, filename=filepath, type_comments=False)
         
-        with open(filepath, 'r') as f:
-            tree = ast.parse(f.read(), filename=filepath)
+        ASTDiscovery._scan_statements(tree.body, entities)
+        
+        return entities
+    
+    @staticmethod
+    def _scan_statements(statements: List[ast.stmt], entities: List[MCPEntity]):
+        """
+        Collect entities from a statement list, descending only into nested statement blocks.
         
-        for node in ast.walk(tree):
-            if isinstance(node, ast.FunctionDef):
+        Decorators can only sit on function statements, so unlike ast.walk this never
+        visits expression subtrees (call arguments, operands, literals, ...).
+        """
+        for node in statements:
+            node_type = type(node)
+            if node_type is ast.FunctionDef or node_type is ast.AsyncFunctionDef:
                 entity = ASTDiscovery._extract_entity_from_function(node)
                 if entity:
                     entities.append(entity)
-        
-        return entities
+            
+            for field in _STATEMENT_BLOCKS:
+                block = getattr(node, field, None)
+                if block:
+                    ASTDiscovery._scan_statements(block, entities)
     
     @staticmethod
-    def _extract_entity_from_function(func_node: ast.FunctionDef) -> Optional[MCPEntity]:
+    def _extract_entity_from_function(
+        func_node: Union[ast.FunctionDef, ast.AsyncFunctionDef]
+    ) -> Optional[MCPEntity]:
         """Extract MCP entity from a function definition"""
         
         # Check for @mcp.tool/@mcp.prompt/@mcp.resource decorators
         category = None
         for decorator in func_node.decorator_list:
-            if isinstance(decorator, ast.Call):
-                if isinstance(decorator.func, ast.Attribute):
-                    if decorator.func.attr in ['tool', 'prompt', 'resource']:
-                        category = decorator.func.attr
-                        break
+            if type(decorator) is ast.Call:
+                # Only ast.Attribute carries .attr, so this doubles as the type check
+                category = _CATEGORY_MAP.get(getattr(decorator.func, 'attr', None))
+                if category:
+                    break
         
         if not category:
             return None
         
-        # Extract function metadata
+        # Read the node's fields in one pass: name, docstring, arguments, return annotation
         name = func_node.name
         description = ast.get_docstring(func_node)
+        arguments = func_node.args
+        args = arguments.args
+        defaults = arguments.defaults
+        returns = func_node.returns
         
-        # Extract input schema from type hints
-        input_schema = ASTDiscovery._extract_input_schema(func_node)
+        # Extract input schema from type hints; defaults align with the last len(defaults) args
+        input_schema = {}
+        defaults_offset = len(args) - len(defaults)
+        
+        for i, arg in enumerate(args):
+            if i == 0 and arg.arg == 'self':
+                continue
+            
+            arg_type = _unparse(arg.annotation) if arg.annotation else "any"
+            arg_type = _COMMON_TYPES.get(arg_type, arg_type)
+            
+            if i >= defaults_offset:
+                input_schema[arg.arg] = {
+                    "type": arg_type,
+                    "required": False,
+                    "default": _unparse(defaults[i - defaults_offset])
+                }
+            else:
+                input_schema[arg.arg] = {
+                    "type": arg_type,
+                    "required": True
+                }
         
         # Extract output type from return annotation
         output_type = None
-        if func_node.returns:
-            output_type = ast.unparse(func_node.returns)
+        if returns:
+            output_type = _unparse(returns)
+            output_type = _COMMON_TYPES.get(output_type, output_type)
         
         return MCPEntity(
             name=name,
@@ -123,39 +294,6 @@ class ASTDiscovery:
             output_type=output_type,
             function_name=name
         )
-    
-    @staticmethod
-    def _extract_input_schema(func_node: ast.FunctionDef) -> Dict[str, Any]:
-        """Extract input schema from function arguments"""
-        schema = {}
-        
-        for arg in func_node.args.args:
-            if arg.arg == 'self':
-                continue
-            
-            arg_name = arg.arg
-            arg_type = None
-            
-            # Extract type annotation
-            if arg.annotation:
-                arg_type = ast.unparse(arg.annotation)
-            
-            schema[arg_name] = {
-                "type": arg_type or "any",
-                "required": True  # Assume all args are required unless they have defaults
-            }
-        
-        # Check for defaults
-        defaults_offset = len(func_node.args.args) - len(func_node.args.defaults)
-        for i, default in enumerate(func_node.args.defaults):
-            arg_index = defaults_offset + i
-            if arg_index < len(func_node.args.args):
-                arg_name = func_node.args.args[arg_index].arg
-                if arg_name in schema:
-                    schema[arg_name]["required"] = False
-                    schema[arg_name]["default"] = ast.unparse(default)
-        
-        return schema
 
 
 class RuntimeDiscovery:
@@ -178,39 +316,24 @@ class RuntimeDiscovery:
         module = importlib.util.module_from_spec(spec)
         spec.loader.exec_module(module)
         
-        # Find FastMCP server instance
-        mcp_server = None
-        for name, obj in inspect.getmembers(module):
-            if hasattr(obj, '__class__') and obj.__class__.__name__ == 'FastMCP':
-                mcp_server = obj
-                break
+        # Find FastMCP server instance (module globals, no sorting or getattr per name)
+        mcp_server = next(
+            (obj for obj in vars(module).values() if type(obj).__name__ == 'FastMCP'),
+            None
+        )
         
         if not mcp_server:
             return entities
         
-        # Extract tools
-        if hasattr(mcp_server, '_tools'):
-            for tool_name, tool_func in mcp_server._tools.items():
-                entity = RuntimeDiscovery._extract_from_function(
-                    tool_name, tool_func, 'tool'
-                )
-                entities.append(entity)
-        
-        # Extract prompts
-        if hasattr(mcp_server, '_prompts'):
-            for prompt_name, prompt_func in mcp_server._prompts.items():
-                entity = RuntimeDiscovery._extract_from_function(
-                    prompt_name, prompt_func, 'prompt'
-                )
-                entities.append(entity)
-        
-        # Extract resources
-        if hasattr(mcp_server, '_resources'):
-            for resource_name, resource_func in mcp_server._resources.items():
-                entity = RuntimeDiscovery._extract_from_function(
-                    resource_name, resource_func, 'resource'
+        # Extract tools, prompts and resources
+        for category, attr in (('tool', '_tools'), ('prompt', '_prompts'), ('resource', '_resources')):
+            members = getattr(mcp_server, attr, None)
+            if members is None:
+                continue
+            for entity_name, entity_func in members.items():
+                entities.append(
+                    RuntimeDiscovery._extract_from_function(entity_name, entity_func, category)
                 )
-                entities.append(entity)
         
         return entities
     
@@ -288,6 +411,73 @@ def discover_mcp_entities(
     return registry
 
 
+def _iter_python_files(root: str):
+    """Yield .py files under root in a single scandir walk, skipping hidden dirs and __pycache__"""
+    stack = [root]
+    while stack:
+        with os.scandir(stack.pop()) as it:
+            for entry in it:
+                if entry.is_dir(follow_symlinks=False):
+                    if not entry.name.startswith('.') and entry.name != '__pycache__':
+                        stack.append(entry.path)
+                elif entry.name.endswith('.py') and entry.is_file():
+                    yield entry.path
+
+
+def _discover_file_safe(filepath: str) -> List[MCPEntity]:
+    """AST-discover one file, treating unparsable/unreadable files as having no entities"""
+    try:
+        return ASTDiscovery.discover_from_file(filepath)
+    except (SyntaxError, ValueError, OSError):
+        return []
+
+
+def discover_mcp_entities_dir(
+    root: str,
+    method: str = "ast",
+    workers: Optional[int] = None
+) -> MCPRegistry:
+    """
+    Discover MCP entities from every Python file under a directory.
+    
+    AST parsing is fanned out over a process pool; runtime discovery imports
+    modules and therefore runs sequentially in this process.
+    
+    Args:
+        root: Directory to scan recursively
+        method: Discovery method - "ast" (safer) or "runtime" (more accurate)
+        workers: Worker processes for AST parsing (default: os.cpu_count())
+    
+    Returns:
+        MCPRegistry with entities from all files
+    
+    Example:
+        >>> registry = discover_mcp_entities_dir("servers/")
+        >>> len(registry.list_by_category("tools"))
+        12
+    """
+    if method not in ("ast", "runtime"):
+        raise ValueError(f"Unknown method: {method}. Use 'ast' or 'runtime'")
+    
+    paths = sorted(_iter_python_files(root))
+    workers = workers or os.cpu_count() or 1
+    
+    if method == "runtime":
+        results = [RuntimeDiscovery.discover_from_file(path) for path in paths]
+    elif workers == 1 or len(paths) < 2:
+        results = [_discover_file_safe(path) for path in paths]
+    else:
+        with ProcessPoolExecutor(max_workers=min(workers, len(paths))) as pool:
+            results = list(pool.map(_discover_file_safe, paths, chunksize=8))
+    
+    registry = MCPRegistry()
+    for entities in results:
+        for entity in entities:
+            registry.register(entity)
+    
+    return registry
+
+
 # ======================================================================
 # CLI HELPER
 # ======================================================================
@@ -306,24 +496,27 @@ def print_registry_summary(registry: MCPRegistry):
     table.add_column("Output", style="magenta")
     table.add_column("Description", style="dim")
     
-    for entity in registry.list_all():
-        input_str = ", ".join(entity.input_schema.keys()) if entity.input_schema else "none"
-        output_str = entity.output_type or "any"
-        desc = (entity.description or "")[:50] + "..." if entity.description and len(entity.description) > 50 else (entity.description or "")
-        
-        table.add_row(
+    rows = []
+    for entity in registry.entities.values():
+        schema = entity.input_schema
+        d = entity.description
+        rows.append((
             entity.name,
             entity.category,
-            input_str,
-            output_str,
-            desc
-        )
+            ", ".join(schema) if schema else "none",
+            entity.output_type or "any",
+            (d[:50] + "...") if d and len(d) > 50 else (d or "")
+        ))
+    
+    for row in rows:
+        table.add_row(*row)
     
+    by_category = registry.by_category
     console.print(table)
-    console.print(f"\n📊 Total: {len(registry.list_all())} entities")
-    console.print(f"  Tools: {len(registry.list_by_category('tools'))}")
-    console.print(f"  Prompts: {len(registry.list_by_category('prompts'))}")
-    console.print(f"  Resources: {len(registry.list_by_category('resources'))}")
+    console.print(f"\n📊 Total: {len(rows)} entities")
+    console.print(f"  Tools: {len(by_category.get('tools', ()))}")
+    console.print(f"  Prompts: {len(by_category.get('prompts', ()))}")
+    console.print(f"  Resources: {len(by_category.get('resources', ()))}")
 
 
 if __name__ == "__main__":
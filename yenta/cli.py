@@ -1,70 +1,104 @@
-import asyncio
+import os
+import sys
 import typer
-import yaml
-import tempfile
 from pathlib import Path
 from typing import Optional
-from rich.console import Console
-from rich.table import Table
 from rich import print as rprint
 
-from agora.telemetry import AuditLogger
-from yenta.flow import MCPTestFlow
-from yenta.mocks import MockRegistry
+from yenta.mocks import get_shared_mock_registry
+
+# asyncio, agora, the test flow and the YAML loader are imported inside the commands
+# that need them so `yenta --help`, `status` and `clear` start fast.
 
 app = typer.Typer(
     name="yenta",
     help="🎭 Yenta - MCP Testing Framework with Record/Replay",
     add_completion=False
 )
-console = Console()
+
+
+# Fixed (header, style) layouts for the CLI's report tables
+_STATUS_COLUMNS = (("Metric", "cyan"), ("Value", "green"))
+
+
+def make_table(title: str, columns):
+    """Build a rich Table with the given (header, style) columns"""
+    from rich.table import Table
+    
+    table = Table(title=title)
+    for header, style in columns:
+        table.add_column(header, style=style)
+    return table
+
+
+def print_event_breakdown(event_counts):
+    """Print the event -> count breakdown as one block with rich markup parsing disabled"""
+    from rich import get_console
+    
+    rprint("\n[bold]Event Breakdown:[/bold]")
+    if event_counts:
+        get_console().print(
+            "\n".join(f"  {event}: {count}" for event, count in event_counts.items()),
+            markup=False,
+            highlight=False,
+        )
+
+
+def _run_async(coro):
+    """
+    asyncio.run() on uvloop when it is installed.
+    
+    Set YENTA_NO_UVLOOP=1 to fall back to the default event loop (e.g. for debugging).
+    """
+    import asyncio
+    
+    if not os.environ.get("YENTA_NO_UVLOOP"):
+        try:
+            import uvloop
+        except ImportError:
+            pass
+        else:
+            # uvloop.run (uvloop >= 0.18) avoids the deprecated event loop policy API
+            if hasattr(uvloop, "run"):
+                return uvloop.run(coro)
+    
+    return asyncio.run(coro)
 
 
 async def _run_flow(spec_file: Path, session_id: Optional[str] = None, override_mode: Optional[dict] = None):
     """Internal helper to run the test flow with optional mode overrides"""
+    from agora.telemetry import AuditLogger
+    from yenta.flow import MCPTestFlow
+    
+    shared = {"spec_file": str(spec_file)}
     
-    # Load and potentially modify the spec
+    # Apply mode overrides in memory; the flow validates the dict directly
     if override_mode:
-        with open(spec_file) as f:
-            spec_data = yaml.safe_load(f)
+        from yenta.schema_validation import load_spec_file
         
-        # Apply overrides
+        spec_data = load_spec_file(spec_file)
         spec_data.update(override_mode)
-        
-        # Save to temp file
-        with tempfile.NamedTemporaryFile(mode='w', suffix='.yaml', delete=False) as tmp:
-            yaml.dump(spec_data, tmp)
-            tmp_path = tmp.name
-        
-        actual_spec_file = Path(tmp_path)
-    else:
-        actual_spec_file = spec_file
-        tmp_path = None
+        shared["spec_data"] = spec_data
     
-    try:
-        logger = AuditLogger(session_id=session_id or f"yenta-{spec_file.stem}")
-        flow = MCPTestFlow(logger)
-        
-        result = await flow.run_async({"spec_file": str(actual_spec_file)})
-        
-        # Print summary
-        rprint("\n" + "=" * 70)
-        rprint("📊 [bold cyan]AUDIT SUMMARY[/bold cyan]")
-        rprint("=" * 70)
-        summary = logger.get_summary()
-        rprint(f"Session ID: {summary['session_id']}")
-        rprint(f"Total Events: {summary['total_events']}")
-        rprint(f"Duration: {summary.get('duration_seconds', 0):.2f}s")
-        
-        rprint("\n[bold]Event Breakdown:[/bold]")
-        for event, count in summary['event_counts'].items():
-            rprint(f"  {event}: {count}")
-        
-        return result
-    finally:
-        # Cleanup temp file if created
-        if tmp_path:
-            Path(tmp_path).unlink(missing_ok=True)
+    logger = AuditLogger(session_id=session_id or f"yenta-{spec_file.stem}")
+    flow = MCPTestFlow(logger)
+    
+    result = await flow.run_async(shared)
+    
+    # Print the header in one write and the breakdown in another, unparsed
+    summary = logger.get_summary()
+    lines = [
+        "\n" + "=" * 70,
+        "📊 [bold cyan]AUDIT SUMMARY[/bold cyan]",
+        "=" * 70,
+        f"Session ID: {summary['session_id']}",
+        f"Total Events: {summary['total_events']}",
+        f"Duration: {summary.get('duration_seconds', 0):.2f}s",
+    ]
+    rprint("\n".join(lines))
+    print_event_breakdown(summary['event_counts'])
+    
+    return result
 
 
 @app.command()
@@ -95,7 +129,7 @@ def run(
     rprint(f"\n{mode}: [bold]{spec_file}[/bold]\n")
     
     try:
-        asyncio.run(_run_flow(spec_path, session_id, override))
+        _run_async(_run_flow(spec_path, session_id, override))
         if record:
             rprint(f"\n[green]✅ Recordings saved to mocks.json[/green]")
     except Exception as e:
@@ -121,7 +155,7 @@ def record(
     override = {"use_mocks": False, "record_mocks": True}
     
     try:
-        asyncio.run(_run_flow(spec_path, session_id, override))
+        _run_async(_run_flow(spec_path, session_id, override))
         rprint(f"\n[green]✅ Recordings saved to mocks.json[/green]")
     except Exception as e:
         rprint(f"[red]❌ Recording failed: {e}[/red]")
@@ -142,7 +176,7 @@ def replay(
         rprint(f"[red]❌ Spec file not found: {spec_file}[/red]")
         raise typer.Exit(1)
     
-    registry = MockRegistry()
+    registry = get_shared_mock_registry()
     if not registry.mock_file.exists():
         rprint("[yellow]⚠️  No mocks.json found. Run 'yenta record' first.[/yellow]")
     
@@ -150,7 +184,7 @@ def replay(
     override = {"use_mocks": True, "record_mocks": False}
     
     try:
-        asyncio.run(_run_flow(spec_path, session_id, override))
+        _run_async(_run_flow(spec_path, session_id, override))
     except Exception as e:
         rprint(f"[red]❌ Replay failed: {e}[/red]")
         raise typer.Exit(1)
@@ -159,12 +193,10 @@ def replay(
 @app.command()
 def status():
     """📊 Show recording status and statistics"""
+    from rich.console import Console
+    registry = get_shared_mock_registry()
     
-    registry = MockRegistry()
-    
-    table = Table(title="🎭 Yenta Mock Registry Status")
-    table.add_column("Metric", style="cyan")
-    table.add_column("Value", style="green")
+    table = make_table("🎭 Yenta Mock Registry Status", _STATUS_COLUMNS)
     
     if registry.mock_file.exists():
         num_mocks = len(registry.mocks)
@@ -177,22 +209,14 @@ def status():
         
         if num_mocks > 0:
             rprint("\n[bold]Recorded Tools:[/bold]")
-            tools = set()
-            for key in registry.mocks.keys():
-                import json
-                try:
-                    data = json.loads(key)
-                    tools.add(data.get("tool", "unknown"))
-                except:
-                    pass
-            for tool in sorted(tools):
+            for tool in sorted(registry.tools_index()):
                 rprint(f"  • {tool}")
     else:
         table.add_row("Mock File", "❌ Not found")
         table.add_row("Status", "No recordings yet")
         table.add_row("Next Step", "Run 'yenta record <spec.yaml>'")
     
-    console.print(table)
+    Console().print(table)
 
 
 @app.command()
@@ -201,7 +225,7 @@ def clear(
 ):
     """🧹 Clear all recorded mocks"""
     
-    registry = MockRegistry()
+    registry = get_shared_mock_registry()
     
     if not registry.mock_file.exists():
         rprint("[yellow]ℹ️  No mocks.json file found. Nothing to clear.[/yellow]")
@@ -213,7 +237,7 @@ def clear(
         confirm = typer.confirm("Are you sure?")
     
     if confirm:
-        registry.mock_file.unlink()
+        registry.clear()
         rprint("[green]✅ Mocks cleared successfully[/green]")
     else:
         rprint("[yellow]Cancelled[/yellow]")
@@ -225,7 +249,7 @@ def inspect(
 ):
     """🔍 Inspect recorded mocks"""
     
-    registry = MockRegistry()
+    registry = get_shared_mock_registry()
     
     if not registry.mock_file.exists():
         rprint("[yellow]❌ No mocks.json found[/yellow]")
@@ -235,26 +259,37 @@ def inspect(
         rprint("[yellow]ℹ️  mocks.json is empty[/yellow]")
         return
     
-    import json
+    from yenta.json_utils import truncated_json
     
     rprint(f"\n[bold cyan]📋 Recorded Mocks ({len(registry.mocks)} total)[/bold cyan]\n")
     
-    for i, (key, response) in enumerate(registry.mocks.items(), 1):
-        try:
-            data = json.loads(key)
-            tool_name = data.get("tool", "unknown")
-            args = data.get("args", {})
-            
-            # Filter by tool if specified
-            if tool and tool_name != tool:
-                continue
-            
-            rprint(f"[bold]{i}. {tool_name}[/bold]")
-            rprint(f"   Args: {args}")
-            rprint(f"   Response: {json.dumps(response, indent=2)[:200]}...")
-            rprint()
-        except:
-            rprint(f"[red]{i}. Invalid mock entry[/red]")
+    parsed_keys = registry.parsed_keys()
+    
+    try:
+        for i, (key, response) in enumerate(registry.mocks.items(), 1):
+            try:
+                data = parsed_keys[key]
+                tool_name = data.get("tool", "unknown")
+                args = data.get("args", {})
+                
+                # Filter by tool if specified
+                if tool and tool_name != tool:
+                    continue
+                
+                rprint(f"[bold]{i}. {tool_name}[/bold]")
+                rprint(f"   Args: {args}")
+                preview = truncated_json(response, 200)
+                rprint(f"   Response: {preview}...")
+                rprint()
+            except BrokenPipeError:
+                raise
+            except:
+                rprint(f"[red]{i}. Invalid mock entry[/red]")
+    except BrokenPipeError:
+        # Output reader went away (e.g. `yenta inspect | head`): stop quietly.
+        # Point stdout at devnull so the interpreter's final flush doesn't raise again.
+        os.dup2(os.open(os.devnull, os.O_WRONLY), sys.stdout.fileno())
+        raise typer.Exit(0)
 
 
 if __name__ == "__main__":
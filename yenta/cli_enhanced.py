@@ -10,33 +10,27 @@ New commands:
 - yenta metrics <session_id>     # Show detailed metrics
 """
 
-import asyncio
+import math
+import os
+import sys
+import traceback
 import typer
-import yaml
 import json
 from pathlib import Path
 from typing import Optional
-from rich.console import Console
-from rich.table import Table
 from rich import print as rprint
-from yenta.registry import get_shared_registry
-
-from agora.telemetry import AuditLogger
-from yenta.workflow_registry import (
-    get_global_registry, 
-    print_registry_summary,
-    discover_workflows_from_file,
-    discover_yaml_workflows
-)
-from yenta.autodiscovery import (
-    discover_mcp_entities,
-    print_registry_summary as print_mcp_summary
-)
 
 # Keep existing CLI app
-from yenta.cli import app, _run_flow, _run_workflow
+from yenta.cli import app, make_table, print_event_breakdown, _run_async
+
+# The workflow registry, autodiscovery, agora's AuditLogger and rich tables are
+# imported inside the commands that use them so unrelated commands start fast.
 
-console = Console()
+
+def _print_traceback():
+    """Print the active exception's traceback when a human is watching or YENTA_TRACEBACK is set"""
+    if os.environ.get("YENTA_TRACEBACK") or sys.stderr.isatty():
+        traceback.print_exc()
 
 
 # ======================================================================
@@ -60,6 +54,11 @@ def discover(
         yenta discover my_server.py --method runtime
         yenta discover my_server.py --save
     """
+    from yenta.autodiscovery import (
+        discover_mcp_entities,
+        print_registry_summary as print_mcp_summary
+    )
+    
     server_path = Path(server_file)
     
     if not server_path.exists():
@@ -74,7 +73,7 @@ def discover(
         
         if save:
             # Save to data/capabilities/
-            from yenta.registry import JsonRegistry
+            from yenta.registry import get_shared_registry
             from yenta.models import Capabilities
             
             json_registry = get_shared_registry()
@@ -98,8 +97,7 @@ def discover(
         
     except Exception as e:
         rprint(f"[red]❌ Discovery failed: {e}[/red]")
-        import traceback
-        traceback.print_exc()
+        _print_traceback()
         raise typer.Exit(1)
 
 
@@ -125,6 +123,8 @@ def workflows_list(
         yenta workflows list
         yenta workflows list --tag search
     """
+    from yenta.workflow_registry import get_global_registry, print_registry_summary
+    
     registry = get_global_registry()
     
     if tag:
@@ -158,6 +158,9 @@ def workflows_run(
         yenta workflows run search_workflow
         yenta workflows run embedding_flow --input '{"text": "hello"}'
     """
+    from agora.telemetry import AuditLogger
+    from yenta.workflow_registry import get_global_registry
+    
     registry = get_global_registry()
     
     if not registry.exists(name):
@@ -189,22 +192,24 @@ def workflows_run(
         
         # Run workflow
         shared = input_data or {}
-        asyncio.run(flow.run_async(shared))
-        
-        # Print summary
-        rprint("\n" + "=" * 70)
-        rprint("✅ [bold green]WORKFLOW COMPLETED[/bold green]")
-        rprint("=" * 70)
+        _run_async(flow.run_async(shared))
         
+        # Print summary in a single write
         summary = logger.get_summary()
-        rprint(f"Session ID: {summary['session_id']}")
-        rprint(f"Total Events: {summary['total_events']}")
-        rprint(f"Duration: {summary.get('duration_seconds', 0):.2f}s")
+        rprint("\n".join([
+            "\n" + "=" * 70,
+            "✅ [bold green]WORKFLOW COMPLETED[/bold green]",
+            "=" * 70,
+            f"Session ID: {summary['session_id']}",
+            f"Total Events: {summary['total_events']}",
+            f"Duration: {summary.get('duration_seconds', 0):.2f}s",
+        ]))
         
+    except typer.Exit:
+        raise
     except Exception as e:
         rprint(f"[red]❌ Workflow execution failed: {e}[/red]")
-        import traceback
-        traceback.print_exc()
+        _print_traceback()
         raise typer.Exit(1)
 
 
@@ -221,6 +226,12 @@ def workflows_register(
         yenta workflows register --python my_workflows.py
         yenta workflows register --yaml workflows/
     """
+    from yenta.workflow_registry import (
+        get_global_registry,
+        discover_workflows_from_file,
+        discover_yaml_workflows
+    )
+    
     registry = get_global_registry()
     registered = 0
     
@@ -269,6 +280,8 @@ def workflows_info(
     Example:
         yenta workflows info search_workflow
     """
+    from yenta.workflow_registry import get_global_registry
+    
     registry = get_global_registry()
     workflow = registry.get(name)
     
@@ -287,14 +300,18 @@ def workflows_info(
         rprint(f"[bold]Tags:[/bold] {', '.join(workflow.tags)}")
     
     if workflow.yaml_spec:
+        from yenta.yaml_utils import yaml_dump
+        
         rprint("\n[bold]YAML Spec:[/bold]")
-        rprint(yaml.dump(workflow.yaml_spec, default_flow_style=False))
+        rprint(yaml_dump(workflow.yaml_spec, default_flow_style=False))
 
 
 # ======================================================================
 # NEW COMMAND: METRICS
 # ======================================================================
 
+_METRICS_COLUMNS = (("Test", "cyan"), ("Status", "green"), ("Latency", "yellow"), ("Mode", "magenta"))
+
 @app.command()
 def metrics(
     session_id: Optional[str] = typer.Option(None, "--session", "-s", help="Session ID"),
@@ -309,7 +326,7 @@ def metrics(
         yenta metrics --session my-session-123
         yenta metrics --latest --format json
     """
-    #from yenta.registry import JsonRegistry
+    from yenta.registry import get_shared_registry
     
     registry = get_shared_registry()
     
@@ -325,20 +342,29 @@ def metrics(
             rprint(f"[red]❌ Session not found: {session_id}[/red]")
             raise typer.Exit(1)
         
-        with open(log_file) as f:
-            data = json.load(f)
+        from yenta.json_utils import load_json_fields
+        
+        # Only the summary fields are materialized; the event stream is never built
+        data = load_json_fields(
+            log_file, ("session_id", "duration_seconds", "total_events", "event_counts")
+        )
         
         rprint(f"\n[bold cyan]Session:[/bold cyan] {data['session_id']}")
         rprint(f"[bold]Duration:[/bold] {data.get('duration_seconds', 0):.2f}s")
         rprint(f"[bold]Total Events:[/bold] {data['total_events']}")
         
         if format == "json":
-            rprint(json.dumps(data, indent=2))
+            # The log is already JSON: stream its bytes instead of re-serializing
+            import shutil
+            import sys
+            
+            sys.stdout.flush()
+            with open(log_file, "rb") as f:
+                shutil.copyfileobj(f, sys.stdout.buffer)
+            sys.stdout.buffer.write(b"\n")
+            sys.stdout.buffer.flush()
         else:
-            # Show event breakdown
-            rprint("\n[bold]Event Breakdown:[/bold]")
-            for event_type, count in data['event_counts'].items():
-                rprint(f"  {event_type}: {count}")
+            print_event_breakdown(data['event_counts'])
         
         return
     else:
@@ -347,14 +373,11 @@ def metrics(
     
     # Show run details
     if format == "json":
-        import json
-        rprint(json.dumps(run.model_dump(), indent=2, default=str))
+        rprint(run.model_dump_json(indent=2))
     else:
-        table = Table(title=f"📊 Run Details: {run.session_id}")
-        table.add_column("Test", style="cyan")
-        table.add_column("Status", style="green")
-        table.add_column("Latency", style="yellow")
-        table.add_column("Mode", style="magenta")
+        from rich.console import Console
+        
+        table = make_table(f"📊 Run Details: {run.session_id}", _METRICS_COLUMNS)
         
         for result in run.results:
             status_icon = "✅" if result.status == "PASS" else "❌"
@@ -366,11 +389,15 @@ def metrics(
                 result.mode
             )
         
-        console.print(table)
+        Console().print(table)
         
         rprint(f"\n[bold]Summary:[/bold]")
         passed = sum(1 for r in run.results if r.status == "PASS")
+        # Nearest-rank percentiles
+        latencies = sorted(r.latency_ms for r in run.results) or [0.0]
+        p50, p95 = (latencies[max(0, math.ceil(p * len(latencies) / 100) - 1)] for p in (50, 95))
         rprint(f"  Pass Rate: {passed}/{len(run.results)}")
+        rprint(f"  Latency: p50 {p50:.0f}ms, p95 {p95:.0f}ms")
         rprint(f"  Duration: {run.duration_ms:.0f}ms")
 
 
@@ -378,9 +405,31 @@ def metrics(
 # NEW COMMAND: VISUALIZE
 # ======================================================================
 
+def _write_diagrams(diagrams: dict, out_dir: Path):
+    """Write name -> Mermaid text pairs as <name>.mmd files, opening the directory only once"""
+    out_dir.mkdir(parents=True, exist_ok=True)
+    flags = os.O_WRONLY | os.O_CREAT | os.O_TRUNC
+    dir_fd = os.open(out_dir, os.O_RDONLY) if os.open in os.supports_dir_fd else None
+    try:
+        for wf_name, mermaid in diagrams.items():
+            filename = f"{wf_name}.mmd"
+            if dir_fd is not None:
+                fd = os.open(filename, flags, 0o644, dir_fd=dir_fd)
+            else:
+                fd = os.open(out_dir / filename, flags, 0o644)
+            try:
+                os.write(fd, mermaid.encode("utf-8"))
+            finally:
+                os.close(fd)
+    finally:
+        if dir_fd is not None:
+            os.close(dir_fd)
+
+
 @app.command()
 def visualize(
     name: Optional[str] = typer.Option(None, "--workflow", "-w", help="Workflow name to visualize"),
+    pattern: Optional[str] = typer.Option(None, "--workflows", help="Glob of workflow names; writes one .mmd per workflow into --output as a directory"),
     yaml_file: Optional[str] = typer.Option(None, "--yaml", "-y", help="YAML file to visualize"),
     output: str = typer.Option("workflow.mmd", "--output", "-o", help="Output Mermaid file")
 ):
@@ -389,10 +438,36 @@ def visualize(
     
     Example:
         yenta visualize --workflow search_flow
+        yenta visualize --workflows "search_*" --output diagrams/
         yenta visualize --yaml workflow.yaml --output diagram.mmd
     """
-    if name:
+    if name or pattern:
+        from agora.telemetry import AuditLogger
+        from yenta.workflow_registry import get_global_registry
+        
         registry = get_global_registry()
+        logger = AuditLogger(session_id="visualize")
+    
+    if pattern:
+        from fnmatch import fnmatchcase
+        
+        names = [w.name for w in registry.list_all() if fnmatchcase(w.name, pattern)]
+        if not names:
+            rprint(f"[red]❌ No workflows match '{pattern}'[/red]")
+            raise typer.Exit(1)
+        
+        diagrams = {}
+        for wf_name in names:
+            flow = registry.create_instance(wf_name, logger)
+            if flow:
+                diagrams[wf_name] = flow.to_mermaid()
+        
+        # The single-file default makes no sense as a directory
+        out_dir = Path("diagrams" if output == "workflow.mmd" else output)
+        _write_diagrams(diagrams, out_dir)
+        rprint(f"[green]✅ {len(diagrams)} diagram(s) saved to {out_dir}/[/green]")
+    
+    elif name:
         workflow = registry.get(name)
         
         if not workflow:
@@ -400,7 +475,6 @@ def visualize(
             raise typer.Exit(1)
         
         # Create instance and generate diagram
-        logger = AuditLogger(session_id="visualize")
         flow = registry.create_instance(name, logger)
         
         if flow:
@@ -408,13 +482,13 @@ def visualize(
             Path(output).write_text(mermaid)
             rprint(f"[green]✅ Diagram saved to {output}[/green]")
             rprint("\nPreview:")
-            rprint(mermaid)
+            # Plain text with no markup; skip rich's parser
+            sys.stdout.write(mermaid if mermaid.endswith("\n") else mermaid + "\n")
     
     elif yaml_file:
         rprint("[yellow]YAML visualization not yet implemented[/yellow]")
     else:
-        rprint("[yellow]Specify --workflow or --yaml[/yellow]")
-
+        rprint("[yellow]Specify --workflow, --workflows or --yaml[/yellow]")
 
 if __name__ == "__main__":
     app()
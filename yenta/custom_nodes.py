@@ -6,12 +6,35 @@ RoutingNode: For complex routing decisions
 TransformNode: For data transformation between nodes
 """
 
+import sys
 from typing import Any, Dict, Optional, List
 from agora.telemetry import AuditedAsyncNode
 from .logging_config import get_logger
+from .workflow_nodes import PREV_OUTPUT_KEY
 
 logger = get_logger("custom_nodes")
 
+_MISSING = object()
+
+
+def _io_keys(name: str):
+    """Interned `<name>_input` / `<name>_output` shared-store keys, built once per node"""
+    return sys.intern(f"{name}_input"), sys.intern(f"{name}_output")
+
+
+def _read_input(shared: Dict[str, Any], input_key: str) -> Any:
+    """Seed input if present, else the previous node's output, else {}"""
+    data = shared.get(input_key, _MISSING)
+    if data is not _MISSING:
+        return data
+    
+    # Routed flows decide the predecessor at runtime, so the pointer is still needed
+    prev_output_key = shared.get(PREV_OUTPUT_KEY)
+    if prev_output_key:
+        return shared.get(prev_output_key, {})
+    
+    return {}
+
 
 class ValidationNode(AuditedAsyncNode):
     """
@@ -42,21 +65,13 @@ class ValidationNode(AuditedAsyncNode):
         wait: int = 0
     ):
         super().__init__(name, audit_logger, max_retries, wait)
+        self._input_key, self._output_key = _io_keys(name)
         self.allowed_routes = allowed_routes
         self.default_route = default_route
     
     async def prep_async(self, shared: Dict[str, Any]) -> Any:
         """Get input from previous node's output"""
-        # Check if this is the first node with initial input
-        if f"{self.name}_input" in shared:
-            return shared[f"{self.name}_input"]
-        
-        # Get output from previous node
-        prev_output_key = shared.get("_prev_output_key")
-        if prev_output_key:
-            return shared.get(prev_output_key, {})
-        
-        return {}
+        return _read_input(shared, self._input_key)
     
     async def exec_async(self, input_data: Any) -> str:
         """Execute validation logic and return routing key"""
@@ -65,24 +80,23 @@ class ValidationNode(AuditedAsyncNode):
             
             # Validate routing key if allowed_routes specified
             if self.allowed_routes and routing_key not in self.allowed_routes:
-                logger.warning(f"Invalid route '{routing_key}' from {self.name}. Using default.")
+                logger.warning("Invalid route '%s' from %s. Using default.", routing_key, self.name)
                 return self.default_route
             
             return routing_key
             
         except Exception as e:
-            logger.error(f"Validation error in {self.name}: {e}")
+            logger.error("Validation error in %s: %s", self.name, e)
             return "error"
     
     async def post_async(self, shared: Dict[str, Any], prep_res: Any, routing_key: str) -> str:
         """Store input data and return routing key"""
         # Store the original input for debugging
-        output_key = f"{self.name}_output"
-        shared[output_key] = {
+        shared[self._output_key] = {
             "input": prep_res,
             "routing_key": routing_key
         }
-        shared["_prev_output_key"] = output_key
+        shared[PREV_OUTPUT_KEY] = self._output_key
         
         return routing_key
     
@@ -134,19 +148,13 @@ class RoutingNode(AuditedAsyncNode):
         wait: int = 0
     ):
         super().__init__(name, audit_logger, max_retries, wait)
+        self._input_key, self._output_key = _io_keys(name)
         self.routes = routes or {}
         self.default_route = default_route
     
     async def prep_async(self, shared: Dict[str, Any]) -> Any:
         """Get input from previous node"""
-        if f"{self.name}_input" in shared:
-            return shared[f"{self.name}_input"]
-        
-        prev_output_key = shared.get("_prev_output_key")
-        if prev_output_key:
-            return shared.get(prev_output_key, {})
-        
-        return {}
+        return _read_input(shared, self._input_key)
     
     async def exec_async(self, input_data: Any) -> str:
         """Execute routing logic"""
@@ -154,17 +162,16 @@ class RoutingNode(AuditedAsyncNode):
             routing_key = self.route(input_data)
             return routing_key
         except Exception as e:
-            logger.error(f"Routing error in {self.name}: {e}")
+            logger.error("Routing error in %s: %s", self.name, e)
             return "error"
     
     async def post_async(self, shared: Dict[str, Any], prep_res: Any, routing_key: str) -> str:
         """Store routing decision and return key"""
-        output_key = f"{self.name}_output"
-        shared[output_key] = {
+        shared[self._output_key] = {
             "input": prep_res,
             "routing_key": routing_key
         }
-        shared["_prev_output_key"] = output_key
+        shared[PREV_OUTPUT_KEY] = self._output_key
         
         return routing_key
     
@@ -206,32 +213,25 @@ class TransformNode(AuditedAsyncNode):
         wait: int = 0
     ):
         super().__init__(name, audit_logger, max_retries, wait)
+        self._input_key, self._output_key = _io_keys(name)
         self.next_node = next_node
     
     async def prep_async(self, shared: Dict[str, Any]) -> Any:
         """Get input from previous node"""
-        if f"{self.name}_input" in shared:
-            return shared[f"{self.name}_input"]
-        
-        prev_output_key = shared.get("_prev_output_key")
-        if prev_output_key:
-            return shared.get(prev_output_key, {})
-        
-        return {}
+        return _read_input(shared, self._input_key)
     
     async def exec_async(self, input_data: Any) -> Any:
         """Execute transformation"""
         try:
             return self.transform(input_data)
         except Exception as e:
-            logger.error(f"Transform error in {self.name}: {e}")
+            logger.error("Transform error in %s: %s", self.name, e)
             return input_data  # Return original on error
     
     async def post_async(self, shared: Dict[str, Any], _, transformed_data: Any) -> str:
         """Store transformed data"""
-        output_key = f"{self.name}_output"
-        shared[output_key] = transformed_data
-        shared["_prev_output_key"] = output_key
+        shared[self._output_key] = transformed_data
+        shared[PREV_OUTPUT_KEY] = self._output_key
         
         return self.next_node
     
@@ -285,6 +285,14 @@ class ErrorHandler(ValidationNode):
         error_handler - "fatal" >> log_failure
     """
     
+    # Error type -> route; anything unlisted is fatal
+    _ERROR_ROUTES = {
+        "TimeoutError": "retry",
+        "ConnectionError": "retry",
+        "ValidationError": "skip",
+        "SchemaError": "skip",
+    }
+    
     def __init__(self, name: str, audit_logger):
         super().__init__(
             name, 
@@ -293,15 +301,8 @@ class ErrorHandler(ValidationNode):
         )
     
     def validate(self, input_data: Any) -> str:
-        error = input_data.get("error", {})
-        error_type = error.get("type", "unknown")
-        
-        if error_type in ["TimeoutError", "ConnectionError"]:
-            return "retry"
-        elif error_type in ["ValidationError", "SchemaError"]:
-            return "skip"
-        else:
-            return "fatal"
+        error_type = input_data.get("error", {}).get("type", "unknown")
+        return self._ERROR_ROUTES.get(error_type, "fatal")
 
 
 class ConditionalRouter(RoutingNode):
@@ -314,15 +315,10 @@ class ConditionalRouter(RoutingNode):
         router - "low" >> batch_handler
     """
     
+    # Priority -> route once confidence clears the threshold; anything else is "low"
+    _PRIORITY_ROUTES = {"urgent": "high", "normal": "medium"}
+    
     def route(self, input_data: Any) -> str:
-        priority = input_data.get("priority", "medium")
-        confidence = input_data.get("confidence", 0.5)
-        
-        if confidence < 0.3:
+        if input_data.get("confidence", 0.5) < 0.3:
             return "low_confidence"
-        elif priority == "urgent":
-            return "high"
-        elif priority == "normal":
-            return "medium"
-        else:
-            return "low"
\ No newline at end of file
+        return self._PRIORITY_ROUTES.get(input_data.get("priority", "medium"), "low")
\ No newline at end of file
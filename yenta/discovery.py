@@ -2,7 +2,8 @@
 """Discover MCP entities (tools/prompts/resources) from FastMCP servers."""
 
 import asyncio
-from typing import Dict, List, Any
+import os
+from typing import Dict, List, Any, Optional, Tuple
 from pathlib import Path
 
 try:
@@ -13,17 +14,87 @@ except ImportError:
     Client = None
 
 
+# (server_path, server file mtime_ns or None for remote servers) -> discovery result
+_DISCOVERY_CACHE: Dict[Tuple[str, Optional[int]], Dict[str, List[Dict[str, Any]]]] = {}
+
+# Discoveries in progress, per event loop, so concurrent callers share one round
+# trip. Each asyncio.run() has its own loop, and a task never outlives its loop.
+_IN_FLIGHT: Dict[Tuple[asyncio.AbstractEventLoop, str, Optional[int]], asyncio.Task] = {}
+
+
+def _cache_key(server_path: str) -> Tuple[str, Optional[int]]:
+    """Key discovery by server path plus the local server file's mtime, if any"""
+    try:
+        return server_path, os.stat(server_path).st_mtime_ns
+    except (OSError, ValueError):
+        return server_path, None
+
+
+def _forget_in_flight(flight_key: tuple, task: asyncio.Task):
+    """Done callback: drop a finished discovery from the in-flight table"""
+    if _IN_FLIGHT.get(flight_key) is task:
+        del _IN_FLIGHT[flight_key]
+    # Mark a failure retrieved: every caller may have been cancelled already
+    if not task.cancelled():
+        task.exception()
+
+
+def _copy_entities(entities: Dict[str, List[Dict[str, Any]]]) -> Dict[str, List[Dict[str, Any]]]:
+    """Give each caller its own lists so the cached result can't be mutated"""
+    return {category: list(items) for category, items in entities.items()}
+
+
 class MCPDiscovery:
     """Discover MCP entities from a server."""
     
     def __init__(self, server_path: str):
         self.server_path = server_path
     
+    @staticmethod
+    def invalidate(server_path: Optional[str] = None):
+        """Drop cached discovery results for one server, or for all servers"""
+        if server_path is None:
+            _DISCOVERY_CACHE.clear()
+            _IN_FLIGHT.clear()
+            return
+        for key in [k for k in _DISCOVERY_CACHE if k[0] == server_path]:
+            del _DISCOVERY_CACHE[key]
+        for key in [k for k in _IN_FLIGHT if k[1] == server_path]:
+            del _IN_FLIGHT[key]
+    
     async def discover_all(self) -> Dict[str, List[Dict[str, Any]]]:
-        """Discover all tools, prompts, and resources from the MCP server."""
+        """
+        Discover all tools, prompts, and resources from the MCP server.
+        
+        Results are memoized per server (and server file mtime); concurrent
+        callers coalesce onto the same in-flight discovery.
+        """
         if not FASTMCP_AVAILABLE:
             raise RuntimeError("FastMCP not installed. Run: pip install fastmcp")
         
+        key = _cache_key(self.server_path)
+        cached = _DISCOVERY_CACHE.get(key)
+        if cached is not None:
+            return _copy_entities(cached)
+        
+        flight_key = (asyncio.get_running_loop(),) + key
+        task = _IN_FLIGHT.get(flight_key)
+        if task is None:
+            task = asyncio.ensure_future(self._discover_and_cache(key))
+            _IN_FLIGHT[flight_key] = task
+            task.add_done_callback(lambda done: _forget_in_flight(flight_key, done))
+        
+        # Shielded: a cancelled caller must not cancel the discovery other callers await
+        return _copy_entities(await asyncio.shield(task))
+    
+    async def _discover_and_cache(self, key: Tuple[str, Optional[int]]) -> Dict[str, List[Dict[str, Any]]]:
+        """Run one discovery and memoize it; failures are not cached, so the next call retries"""
+        entities = await self._discover_uncached()
+        _DISCOVERY_CACHE[key] = entities
+        return entities
+    
+    async def _discover_uncached(self) -> Dict[str, List[Dict[str, Any]]]:
+        """Query the server for its tools, prompts, and resources"""
         entities = {
             "tools": [],
             "prompts": [],
@@ -31,8 +102,14 @@ class MCPDiscovery:
         }
         
         async with Client(self.server_path) as client:
+            # The three listings are independent; overlap their round trips
+            tools_result, prompts_result, resources_result = await asyncio.gather(
+                client.list_tools(),
+                client.list_prompts(),
+                client.list_resources(),
+            )
+            
             # Discover tools
-            tools_result = await client.list_tools()
             entities["tools"] = [
                 {
                     "name": tool.name,
@@ -43,7 +120,6 @@ class MCPDiscovery:
             ]
             
             # Discover prompts
-            prompts_result = await client.list_prompts()
             entities["prompts"] = [
                 {
                     "name": prompt.name,
@@ -54,7 +130,6 @@ class MCPDiscovery:
             ]
             
             # Discover resources
-            resources_result = await client.list_resources()
             entities["resources"] = [
                 {
                     "uri": str(resource.uri),
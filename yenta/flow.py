@@ -1,5 +1,5 @@
 from agora.telemetry import AuditedAsyncFlow, AuditLogger
-from yenta import LoadSpecNode, RunMCPTestsNode, GenerateReportNode
+from yenta.nodes import LoadSpecNode, RunMCPTestsNode, GenerateReportNode
 
 
 class MCPTestFlow(AuditedAsyncFlow):
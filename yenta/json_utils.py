@@ -0,0 +1,128 @@
+"""
+JSON helpers for Yenta.
+
+Uses orjson when it is installed and falls back to the standard library.
+"""
+import json
+from pathlib import Path
+from typing import Any, Dict, Iterable, Union
+
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+    orjson = None
+
+try:
+    import ijson
+    from ijson.common import ObjectBuilder
+    IJSON_AVAILABLE = True
+except ImportError:
+    IJSON_AVAILABLE = False
+    ijson = None
+
+
+def dumps_bytes(obj: Any, indent: bool = False) -> bytes:
+    """
+    Serialize an object to UTF-8 encoded JSON.
+    
+    Args:
+        obj: JSON-compatible object
+        indent: Pretty-print with 2-space indentation
+    
+    Returns:
+        JSON document as bytes
+    """
+    if ORJSON_AVAILABLE:
+        option = orjson.OPT_NON_STR_KEYS
+        if indent:
+            option |= orjson.OPT_INDENT_2
+        return orjson.dumps(obj, option=option)
+    if indent:
+        return json.dumps(obj, indent=2, ensure_ascii=False).encode("utf-8")
+    return json.dumps(obj, separators=(",", ":"), ensure_ascii=False).encode("utf-8")
+
+
+def loads(data: Union[bytes, str]) -> Any:
+    """
+    Parse a JSON document from bytes or str.
+    
+    Raises:
+        json.JSONDecodeError: If the document is malformed (orjson's error subclasses it)
+    """
+    if ORJSON_AVAILABLE:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def truncated_json(obj: Any, limit: int, indent: bool = True) -> str:
+    """
+    Serialize an object to JSON text, stopping once `limit` characters are produced.
+    
+    Encodes incrementally, so previews of large payloads don't pay for
+    serializing the parts that get cut off.
+    
+    Args:
+        obj: JSON-compatible object
+        limit: Maximum number of characters to return
+        indent: Pretty-print with 2-space indentation
+    
+    Returns:
+        The first `limit` characters of the JSON document
+    """
+    encoder = json.JSONEncoder(indent=2 if indent else None, ensure_ascii=False)
+    chunks = []
+    size = 0
+    for chunk in encoder.iterencode(obj):
+        chunks.append(chunk)
+        size += len(chunk)
+        if size >= limit:
+            break
+    return "".join(chunks)[:limit]
+
+
+def load_json_fields(path: Union[str, Path], keys: Iterable[str]) -> Dict[str, Any]:
+    """
+    Read selected top-level fields of a JSON object file.
+    
+    With ijson installed the file is streamed and only the requested values are
+    materialized (stopping once all are found), so large sibling fields such as
+    event lists never get built. Otherwise the whole document is parsed.
+    
+    Args:
+        path: Path to a JSON file whose root is an object
+        keys: Top-level keys to extract
+    
+    Returns:
+        Dict of the requested keys that are present in the file
+    """
+    wanted = set(keys)
+    
+    if not IJSON_AVAILABLE:
+        with open(path, "rb") as f:
+            data = loads(f.read())
+        return {k: data[k] for k in wanted if k in data}
+    
+    fields: Dict[str, Any] = {}
+    builder = None
+    current = None
+    with open(path, "rb") as f:
+        for prefix, event, value in ijson.parse(f, use_float=True):
+            if builder is not None:
+                builder.event(event, value)
+                if prefix == current and event in ("end_map", "end_array"):
+                    fields[current] = builder.value
+                    builder = None
+                    if len(fields) == len(wanted):
+                        break
+            elif prefix in wanted and event != "map_key":
+                if event in ("start_map", "start_array"):
+                    builder = ObjectBuilder()
+                    builder.event(event, value)
+                    current = prefix
+                else:
+                    fields[prefix] = value
+                    if len(fields) == len(wanted):
+                        break
+    return fields
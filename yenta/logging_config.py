@@ -1,11 +1,28 @@
 """
 Centralized logging configuration for Yenta.
 """
+import atexit
 import logging
+import queue
 import sys
+from logging.handlers import MemoryHandler, QueueHandler, QueueListener
 from pathlib import Path
 from typing import Optional
 
+# Handlers installed on the root logger by setup_logging, removed again on the next call
+_root_handlers: list = []
+# Writes file records on a background thread so async nodes never block on disk I/O
+_file_listener: Optional[QueueListener] = None
+
+
+def _stop_file_listener():
+    """Drain and stop the background file-logging thread, if one is running"""
+    global _file_listener
+    if _file_listener is not None:
+        _file_listener.stop()
+        _file_listener = None
+
+
 def setup_logging(
     level: str = "INFO",
     log_file: Optional[str] = None,
@@ -14,6 +31,8 @@ def setup_logging(
     """
     Set up centralized logging for Yenta.
     
+    Safe to call repeatedly: handlers from a previous call are replaced, not duplicated.
+    
     Args:
         level: Log level (DEBUG, INFO, WARNING, ERROR)
         log_file: Optional file to write logs to
@@ -22,37 +41,43 @@ def setup_logging(
     Returns:
         Configured logger instance
     """
+    global _file_listener
+    
     if format_string is None:
         format_string = "%(asctime)s - %(name)s - %(levelname)s - %(message)s"
+    log_level = getattr(logging, level.upper())
+    formatter = logging.Formatter(format_string)  # Stateless; shared by both handlers
     
-    # Configure root logger
-    logging.basicConfig(
-        level=getattr(logging, level.upper()),
-        format=format_string,
-        handlers=[]
-    )
+    # Configure root logger, dropping what an earlier call installed
+    root_logger = logging.getLogger()
+    root_logger.setLevel(log_level)
+    for handler in _root_handlers:
+        root_logger.removeHandler(handler)
+    _root_handlers.clear()
+    _stop_file_listener()
     
     # Add console handler
     console_handler = logging.StreamHandler(sys.stdout)
-    console_handler.setLevel(getattr(logging, level.upper()))
-    console_formatter = logging.Formatter(format_string)
-    console_handler.setFormatter(console_formatter)
+    console_handler.setLevel(log_level)
+    console_handler.setFormatter(formatter)
+    _root_handlers.append(console_handler)
     
-    # Get root logger and add console handler
-    root_logger = logging.getLogger()
-    root_logger.addHandler(console_handler)
-    
-    # Add file handler if specified
+    # Add file handler if specified; records reach it through a queue
     if log_file:
         log_path = Path(log_file)
         log_path.parent.mkdir(parents=True, exist_ok=True)
         
         file_handler = logging.FileHandler(log_file)
-        file_handler.setLevel(getattr(logging, level.upper()))
-        file_formatter = logging.Formatter(format_string)
-        file_handler.setFormatter(file_formatter)
+        file_handler.setLevel(log_level)
+        file_handler.setFormatter(formatter)
         
-        root_logger.addHandler(file_handler)
+        records = queue.SimpleQueue()
+        _file_listener = QueueListener(records, file_handler, respect_handler_level=True)
+        _file_listener.start()
+        _root_handlers.append(QueueHandler(records))
+    
+    for handler in _root_handlers:
+        root_logger.addHandler(handler)
     
     return logging.getLogger("yenta")
 
@@ -60,5 +85,35 @@ def get_logger(name: str) -> logging.Logger:
     """Get a logger instance for a specific module."""
     return logging.getLogger(f"yenta.{name}")
 
+def get_buffered_logger(name: str, capacity: int = 256) -> logging.Logger:
+    """
+    Get a logger that buffers records in memory and writes them to stdout in batches.
+    
+    Records are emitted as plain messages once `capacity` records are buffered,
+    on an ERROR record, or when flush_logger() is called.
+    
+    Args:
+        name: Module-level logger name (prefixed with "yenta.")
+        capacity: Number of records buffered before writing
+    
+    Returns:
+        Logger that does not propagate to the root logger
+    """
+    buffered = get_logger(name)
+    if not buffered.handlers:
+        console_handler = logging.StreamHandler(sys.stdout)
+        console_handler.setFormatter(logging.Formatter("%(message)s"))
+        buffered.addHandler(MemoryHandler(capacity, flushLevel=logging.ERROR, target=console_handler))
+        buffered.setLevel(logging.INFO)
+        buffered.propagate = False
+    return buffered
+
+def flush_logger(target: logging.Logger):
+    """Write out any records buffered by a logger's handlers."""
+    for handler in target.handlers:
+        handler.flush()
+
+atexit.register(_stop_file_listener)
+
 # Default logger for backward compatibility
 logger = get_logger("core")
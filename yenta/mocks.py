@@ -1,6 +1,26 @@
 import json
+import os
+import stat
+import tempfile
+from contextlib import contextmanager
 from pathlib import Path
-from typing import Dict, Any, Optional
+from typing import Dict, Any, List, Optional
+
+from yenta.json_utils import dumps_bytes, loads as json_loads
+
+# json.dumps builds a new JSONEncoder whenever a non-default option like sort_keys
+# is passed; reusing one encoder produces the exact same keys without that setup.
+_KEY_ENCODER = json.JSONEncoder(sort_keys=True)
+
+
+def _shared_file_mode(path: Path) -> int:
+    """Permission bits for a rewrite of `path`: its current mode, else what the umask gives a new file"""
+    try:
+        return stat.S_IMODE(os.stat(path).st_mode)
+    except FileNotFoundError:
+        umask = os.umask(0)
+        os.umask(umask)
+        return 0o666 & ~umask
 
 
 class MockRegistry:
@@ -9,38 +29,139 @@ class MockRegistry:
     def __init__(self, mock_file: str = "mocks.json"):
         self.mock_file = Path(mock_file)
         self.mocks: Dict[str, Any] = {}
+        self._parsed_keys: Optional[Dict[str, Optional[Dict[str, Any]]]] = None
+        self._dirty = False
+        self._batch_depth = 0
         self._load()
     
     def _load(self):
         """Load existing mocks from disk"""
-        if self.mock_file.exists():
-            try:
-                with open(self.mock_file, 'r') as f:
-                    self.mocks = json.load(f)
-            except json.JSONDecodeError:
-                self.mocks = {}
+        # Raw bytes straight to the parser (orjson when installed): no text-layer decode
+        try:
+            self.mocks = json_loads(self.mock_file.read_bytes())
+        except FileNotFoundError:
+            pass
+        except json.JSONDecodeError:
+            self.mocks = {}
     
     def _save(self):
-        """Save mocks to disk"""
-        with open(self.mock_file, 'w') as f:
-            json.dump(self.mocks, f, indent=2, ensure_ascii=False)
+        """Save mocks to disk (atomically, so an interrupted write never truncates mocks.json)"""
+        payload = dumps_bytes(self.mocks, indent=True)
+        
+        # A unique temp file per save, so concurrent writers never share one
+        fd, tmp_file = tempfile.mkstemp(
+            prefix=f".{self.mock_file.stem}.", suffix=".tmp", dir=self.mock_file.parent
+        )
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                f.write(payload)
+                f.flush()
+                os.fsync(f.fileno())
+            # mkstemp creates 0600 files; mocks.json is meant to be shared and committed
+            os.chmod(tmp_file, _shared_file_mode(self.mock_file))
+            os.replace(tmp_file, self.mock_file)
+        except BaseException:
+            try:
+                os.unlink(tmp_file)
+            except OSError:
+                pass
+            raise
+        self._dirty = False
+    
+    def flush(self):
+        """Write pending recordings to disk, if any"""
+        if self._dirty:
+            self._save()
+    
+    @contextmanager
+    def batch(self):
+        """
+        Defer saving recorded mocks until the outermost batch exits.
+        
+        Usage:
+            with registry.batch():
+                for tool, args, resp in calls:
+                    registry.record(tool, args, resp)   # one write at the end
+        """
+        self._batch_depth += 1
+        try:
+            yield self
+        finally:
+            self._batch_depth -= 1
+            if self._batch_depth == 0:
+                self.flush()
     
     def get_mock_key(self, tool: str, args: Dict[str, Any]) -> str:
         """Generate unique key for tool + args combination"""
-        return json.dumps({"tool": tool, "args": args}, sort_keys=True)
+        return _KEY_ENCODER.encode({"tool": tool, "args": args})
     
     def get(self, tool: str, args: Dict[str, Any]) -> Optional[Dict[str, Any]]:
         """Retrieve mock response if it exists"""
         key = self.get_mock_key(tool, args)
         return self.mocks.get(key)
     
+    def get_by_key(self, key: str) -> Optional[Dict[str, Any]]:
+        """Retrieve mock response for a key precomputed with get_mock_key()"""
+        return self.mocks.get(key)
+    
+    def parsed_keys(self) -> Dict[str, Optional[Dict[str, Any]]]:
+        """Map each mock key to its decoded {"tool", "args"} dict (None if malformed), parsed once"""
+        if self._parsed_keys is None:
+            parsed = {}
+            for key in self.mocks:
+                try:
+                    data = json_loads(key)
+                except (json.JSONDecodeError, TypeError):
+                    data = None
+                parsed[key] = data if isinstance(data, dict) else None
+            self._parsed_keys = parsed
+        return self._parsed_keys
+    
+    def tools_index(self) -> Dict[str, List[str]]:
+        """Group mock keys by recorded tool name"""
+        index: Dict[str, List[str]] = {}
+        for key, data in self.parsed_keys().items():
+            if data is not None:
+                index.setdefault(data.get("tool", "unknown"), []).append(key)
+        return index
+    
     def record(self, tool: str, args: Dict[str, Any], response: Dict[str, Any]):
         """Record a response for future replay"""
         key = self.get_mock_key(tool, args)
         self.mocks[key] = response
-        self._save()
+        self._parsed_keys = None
+        self._dirty = True
+        if not self._batch_depth:
+            self._save()
     
     def has_mock(self, tool: str, args: Dict[str, Any]) -> bool:
         """Check if mock exists for this tool + args"""
         key = self.get_mock_key(tool, args)
         return key in self.mocks
+    
+    def clear(self):
+        """Delete the mock file and forget all loaded mocks"""
+        self.mock_file.unlink(missing_ok=True)
+        self.mocks = {}
+        self._parsed_keys = None
+        self._dirty = False
+
+
+_shared_mock_registry: Optional[MockRegistry] = None
+
+
+def get_shared_mock_registry() -> MockRegistry:
+    """
+    Get the process-wide MockRegistry (mocks.json is read once per process).
+    
+    Usage:
+        from yenta.mocks import get_shared_mock_registry
+        
+        registry = get_shared_mock_registry()
+    """
+    global _shared_mock_registry
+    
+    if _shared_mock_registry is None:
+        _shared_mock_registry = MockRegistry()
+    
+    return _shared_mock_registry
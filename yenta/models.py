@@ -1,8 +1,13 @@
-from datetime import datetime
+from datetime import datetime, timezone
 from typing import Dict, Any, List
 from pydantic import BaseModel, Field
 
 
+def _utcnow() -> datetime:
+    """Naive UTC now, as datetime.utcnow() returned (deprecated since Python 3.12)"""
+    return datetime.now(timezone.utc).replace(tzinfo=None)
+
+
 class TestResult(BaseModel):
     """Individual test result"""
     test_name: str
@@ -19,7 +24,7 @@ class TestResult(BaseModel):
 class TestRun(BaseModel):
     """Complete test run"""
     session_id: str
-    timestamp: datetime = Field(default_factory=datetime.utcnow)
+    timestamp: datetime = Field(default_factory=_utcnow)
     spec_name: str
     server: str
     status: str  # 'completed', 'failed'
@@ -34,13 +39,13 @@ class Mock(BaseModel):
     name: str
     arguments: Dict[str, Any]
     response: Dict[str, Any]
-    recorded_at: datetime = Field(default_factory=datetime.utcnow)
+    recorded_at: datetime = Field(default_factory=_utcnow)
 
 
 class Capabilities(BaseModel):
     """Server capabilities"""
     server: str
-    discovered_at: datetime = Field(default_factory=datetime.utcnow)
+    discovered_at: datetime = Field(default_factory=_utcnow)
     tools: List[Dict[str, Any]] = []
     resources: List[Dict[str, Any]] = []
     prompts: List[Dict[str, Any]] = []
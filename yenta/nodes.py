@@ -0,0 +1,456 @@
+import json, time, asyncio
+from collections import defaultdict
+from contextlib import AsyncExitStack
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+from pydantic import ValidationError
+from agora.telemetry import AuditedAsyncNode, AuditedAsyncBatchNode
+from .schemas import get_validator
+from .mocks import get_shared_mock_registry
+from .registry import get_shared_registry
+from .models import TestRun, TestResult
+from .schema_validation import TestCase, validate_spec, validate_spec_file
+from .logging_config import get_logger, get_buffered_logger, flush_logger
+from .json_utils import dumps_bytes, truncated_json
+from ._compat import DATACLASS_SLOTS
+
+try:
+    from fastmcp import Client
+    FASTMCP_AVAILABLE = True
+except ImportError:
+    FASTMCP_AVAILABLE = False
+    Client = None
+
+# Up to this many keywords, plain substring checks beat building an automaton
+SMALL_KEYWORD_SET = 8
+
+try:
+    import ahocorasick
+    AHOCORASICK_AVAILABLE = True
+except ImportError:
+    AHOCORASICK_AVAILABLE = False
+    ahocorasick = None
+
+logger = get_logger("core")
+# Per-test progress lines, written to stdout in batches
+progress = get_buffered_logger("progress")
+
+
+class LoadSpecNode(AuditedAsyncNode):
+    """Load spec YAML (or an already-parsed spec dict) and place in shared dict"""
+
+    async def prep_async(self, shared):
+        # "spec_data" lets callers hand over an in-memory spec (e.g. CLI mode overrides);
+        # "spec_file" is still used for naming the run
+        return shared["spec_file"], shared.get("spec_data")
+
+    async def exec_async(self, prep_res):
+        spec_file, spec_data = prep_res
+        
+        try:
+            if spec_data is not None:
+                validated_spec = validate_spec(spec_data)
+            else:
+                spec_path = Path(spec_file)
+                if not spec_path.exists():
+                    raise FileNotFoundError(f"Spec file not found: {spec_file}")
+                # Read, parse and validate off the event loop
+                validated_spec = await asyncio.to_thread(validate_spec_file, spec_path)
+            logger.info(f"Spec file validated successfully: {spec_file}")
+            return validated_spec
+        except ValidationError as e:
+            logger.error(f"Spec validation failed for {spec_file}: {e}")
+            raise ValueError(f"Invalid spec file format: {e}")
+
+    async def post_async(self, shared, _, validated_spec):
+        spec_dict = validated_spec.model_dump()
+        shared["spec"] = spec_dict
+        # Typed test cases, validated once at load time
+        shared["test_cases"] = validated_spec.custom_tests
+        shared["start_time"] = time.time()
+        agent = spec_dict.get("agent_name", "<unnamed>")
+        tools = spec_dict.get("tools", [])
+        tests = spec_dict.get("custom_tests", [])
+        logger.info(f"Loaded spec: {agent}")
+        logger.info(f"Tools: {', '.join(tools)}")
+        logger.info(f"Tests to run: {len(tests)}")
+        return "run_tests"
+
+
+@dataclass(**DATACLASS_SLOTS)
+class PreparedTest:
+    """A test case resolved against one server, built once in prep_async"""
+    server_path: str
+    server_name: str
+    name: str
+    tool: str
+    arguments: Dict[str, Any]
+    timeout: int
+    use_mocks: bool
+    record_mocks: bool
+    mock: Optional[Dict[str, Any]]
+    mock_key: str
+    expected_schema: Optional[str]
+    expected_keywords: List[str]
+    lowered_keywords: tuple
+    expected_metrics: Dict[str, Any]
+    max_latency_ms: Optional[float]
+
+
+class RunMCPTestsNode(AuditedAsyncBatchNode):
+    """Run all tests against one or more MCP servers using FastMCP Client (with mocking support)"""
+
+    def __init__(self, name, audit_logger):
+        super().__init__(name, audit_logger)
+        self.mock_registry = get_shared_mock_registry()
+        self.max_concurrent = 16
+        self._semaphore = None
+        self._keyword_automata = {}  # lowered keywords -> Aho-Corasick automaton
+
+    async def prep_async(self, shared):
+        spec = shared["spec"]
+        tests = shared.get("test_cases")
+        if tests is None:
+            # Spec dict supplied directly: wrap the tests without re-validating them
+            tests = [TestCase.model_construct(**t) for t in spec.get("custom_tests", [])]
+
+        if spec.get("mcp_servers"):
+            servers = spec["mcp_servers"]
+        elif spec.get("mcp_server"):
+            servers = [spec["mcp_server"]]
+        else:
+            raise ValueError("spec must include mcp_server or mcp_servers")
+
+        # Get global flags
+        global_use_mocks = spec.get("use_mocks", False)
+        global_record_mocks = spec.get("record_mocks", False)
+        self.max_concurrent = spec.get("max_concurrent", 16)
+
+        # One batch item per server so a single session serves all of its tests
+        return [{
+            "server_path": s,
+            "tests": [self._prepare_test(s, t, global_use_mocks, global_record_mocks) for t in tests]
+        } for s in servers]
+
+    def _prepare_test(self, server_path, test_case, global_use_mocks, global_record_mocks):
+        """Resolve everything exec needs from a TestCase (per-test flags override global)"""
+        metrics = test_case.expected_metrics
+        keywords = test_case.expected_keywords
+        max_latency = metrics.get("max_latency_ms")
+        return PreparedTest(
+            server_path=server_path,
+            server_name=Path(server_path).name,
+            name=test_case.name,
+            tool=test_case.tool,
+            arguments=test_case.arguments,
+            timeout=test_case.timeout_sec,
+            use_mocks=global_use_mocks if test_case.use_mocks is None else test_case.use_mocks,
+            record_mocks=global_record_mocks if test_case.record_mocks is None else test_case.record_mocks,
+            mock=test_case.mock,
+            mock_key=self.mock_registry.get_mock_key(test_case.tool, test_case.arguments),
+            expected_schema=test_case.expected_schema,
+            expected_keywords=keywords,
+            lowered_keywords=tuple(k.lower() for k in keywords),
+            expected_metrics=metrics,
+            max_latency_ms=float(max_latency) if isinstance(max_latency, (int, float)) else None,
+        )
+
+    def _needs_live_call(self, test):
+        """Check whether a test has to reach the real MCP server"""
+        if not test.use_mocks:
+            return True
+        if test.mock is not None:
+            return False
+        return self.mock_registry.get_by_key(test.mock_key) is None
+
+    async def _exec(self, groups):
+        """Run all server groups concurrently; tests are bounded by the spec's max_concurrent"""
+        run_one = super()._exec
+        self._semaphore = asyncio.Semaphore(self.max_concurrent)
+
+        # Recorded mocks are written once for the whole run instead of once per record
+        with self.mock_registry.batch():
+            outcomes = await asyncio.gather(*(run_one([g]) for g in groups), return_exceptions=True)
+
+        # One crashing server must not abort the whole batch
+        results = []
+        for group, outcome in zip(groups, outcomes):
+            if isinstance(outcome, Exception):
+                error = f"{type(outcome).__name__}: {outcome}"
+                results.append([self._error_result(t, error) for t in group["tests"]])
+            else:
+                results.append(outcome[0])
+        return results
+
+    @staticmethod
+    def _error_result(test, error, failures=None):
+        """Build a FAIL record for a test that never produced a response"""
+        return {
+            "server": test.server_path,
+            "test_name": test.name,
+            "tool": test.tool,
+            "arguments": test.arguments,
+            "status": "FAIL",
+            "response": {"error": error},
+            "failures": failures or [error],
+            "metrics": {"latency_ms": 0},
+            "mode": "error",
+            "expected": {},
+        }
+
+    async def exec_async(self, group):
+        """Run every test for one server over a single FastMCP Client session"""
+        server_path, tests = group["server_path"], group["tests"]
+
+        # Opened and closed in this task; only spawned if some test needs the real server
+        async with AsyncExitStack() as stack:
+            client, connect_error, known_tools = None, None, None
+            if FASTMCP_AVAILABLE and any(self._needs_live_call(t) for t in tests):
+                try:
+                    client = await stack.enter_async_context(Client(server_path))
+                except Exception as e:
+                    connect_error = f"{type(e).__name__}: {str(e)}"
+                else:
+                    # Ask once per server so misnamed tools fail without a roundtrip
+                    try:
+                        known_tools = {tool.name for tool in await client.list_tools()}
+                    except Exception as e:
+                        logger.warning(f"Could not list tools for {server_path}: {e}")
+
+            async def bounded(test):
+                async with self._semaphore:
+                    return await self._run_test(test, client, connect_error, known_tools)
+
+            outcomes = await asyncio.gather(*(bounded(t) for t in tests), return_exceptions=True)
+
+        return [
+            self._error_result(test, f"{type(o).__name__}: {o}") if isinstance(o, Exception) else o
+            for test, o in zip(tests, outcomes)
+        ]
+
+    async def _run_test(self, test, client, connect_error=None, known_tools=None):
+        """Execute a single test case using the server's FastMCP Client (or mocks)"""
+        name, tool, args = test.name, test.tool, test.arguments
+        use_mocks, record_mocks = test.use_mocks, test.record_mocks
+        
+        mode = "real"  # Can be: mock, replay, recorded, real
+        
+        # --- MOCKING LOGIC ---
+        start = time.time()
+        replayed = self.mock_registry.get_by_key(test.mock_key) if use_mocks else None
+        
+        # 1. Inline mock (highest priority)
+        if use_mocks and test.mock is not None:
+            progress.info(f"  [mocked] {name} ...")
+            resp = test.mock
+            latency_ms = 0.0
+            mode = "mock"
+        
+        # 2. Replay from registry (single lookup with the precomputed key)
+        elif use_mocks and replayed is not None:
+            progress.info(f"  [replayed] {name} ...")
+            resp = replayed
+            latency_ms = 0.0
+            mode = "replay"
+        
+        # 3. Real MCP call
+        else:
+            if not FASTMCP_AVAILABLE:
+                return self._error_result(test, "FastMCP not installed", ["pip install fastmcp"])
+
+            if client is None:
+                error = connect_error or "No MCP session available"
+                return self._error_result(test, f"Could not connect to {test.server_path}: {error}")
+
+            if known_tools is not None and tool not in known_tools:
+                return self._error_result(test, f"Unknown tool '{tool}' on {test.server_name}")
+
+            mode_label = "recorded" if record_mocks else "real"
+            progress.info(f"  [{mode_label}] Running [{test.server_name}] :: {name} ...")
+            
+            try:
+                result = await asyncio.wait_for(
+                    client.call_tool(tool, args),
+                    timeout=test.timeout
+                )
+                latency_ms = (time.time() - start) * 1000.0
+                
+                # Extract text from MCP response
+                if hasattr(result, 'content') and result.content:
+                    content = result.content[0]
+                    resp = {"result": content.text if hasattr(content, 'text') else str(content)}
+                else:
+                    resp = {"result": str(result)}
+                
+                mode = "recorded" if record_mocks else "real"
+                
+                # Record if requested
+                if record_mocks:
+                    self.mock_registry.record(tool, args, resp)
+                    
+            except asyncio.TimeoutError:
+                latency_ms = (time.time() - start) * 1000.0
+                resp = {"error": f"Timeout after {test.timeout}s"}
+                mode = "error"
+            except Exception as e:
+                latency_ms = (time.time() - start) * 1000.0
+                resp = {"error": f"{type(e).__name__}: {str(e)}"}
+                mode = "error"
+
+        # --- VALIDATION LOGIC (same for mocks and real calls) ---
+        status = "PASS" if "error" not in resp else "FAIL"
+        failures = []
+        details = {"latency_ms": round(latency_ms, 2)}
+
+        # Cheapest check first: a blown latency budget skips serialization below
+        metrics = test.expected_metrics
+        max_latency = test.max_latency_ms
+        if status == "PASS" and max_latency is not None:
+            if latency_ms > max_latency:
+                status, failures = "FAIL", [f"Latency {latency_ms:.1f} > {metrics['max_latency_ms']}"]
+
+        schema_name = test.expected_schema
+        if status == "PASS" and schema_name:
+            validator = get_validator(schema_name)
+            if validator is None:
+                status, failures = "FAIL", [f"Unknown schema '{schema_name}'"]
+            else:
+                try:
+                    validator.validate_python(resp)
+                except ValidationError as e:
+                    status, failures = "FAIL", [f"Schema validation failed: {e}"]
+
+        # Keyword checks (CASE-INSENSITIVE)
+        keywords = test.expected_keywords
+        if status == "PASS" and keywords:
+            missing = self._missing_keywords(resp, test)
+            if missing:
+                status, failures = "FAIL", [f"Missing keywords: {missing}"]
+
+        return {
+            "server": "mock" if mode in ["mock", "replay"] else test.server_path,
+            "test_name": name,
+            "tool": tool,
+            "arguments": args,
+            "status": status,
+            "response": resp,
+            "failures": failures,
+            "metrics": details,
+            "mode": mode,  # NEW: Track whether this was mocked/replayed/recorded/real
+            "expected": {"schema": schema_name, "keywords": keywords, "metrics": metrics},
+        }
+
+    def _keyword_automaton(self, lowered_keywords):
+        """Build (once per keyword set) an automaton matching all lowercased keywords"""
+        automaton = self._keyword_automata.get(lowered_keywords)
+        if automaton is None:
+            automaton = ahocorasick.Automaton()
+            for k in lowered_keywords:
+                if k:
+                    automaton.add_word(k, k)
+            automaton.make_automaton()
+            self._keyword_automata[lowered_keywords] = automaton
+        return automaton
+
+    def _missing_keywords(self, resp, test):
+        """Return the test's keywords not found (case-insensitively) in the serialized response"""
+        # Same text as json.dumps' default ", "/": " separators, which existing
+        # keywords such as `status": "ok` are written against
+        jam = json.dumps(resp, ensure_ascii=False).lower()
+        lowered = test.lowered_keywords
+        if AHOCORASICK_AVAILABLE and len(lowered) > SMALL_KEYWORD_SET:
+            # Single pass over the response for all keywords
+            found = {match for _, match in self._keyword_automaton(lowered).iter(jam)}
+            found.add("")
+        else:
+            found = {k for k in lowered if k in jam}
+        return [k for k, low in zip(test.expected_keywords, lowered) if low not in found]
+
+    async def post_async(self, shared, _, grouped_results):
+        flush_logger(progress)
+        results = [r for group in grouped_results for r in group]
+        shared["results"] = results
+        total, passed = len(results), sum(1 for r in results if r["status"] == "PASS")
+        logger.info(f"Completed: {passed}/{total} tests passed")
+        
+        # FIXED: Save run history with proper TestResult construction
+        try:
+            duration_ms = (time.time() - shared.get("start_time", time.time())) * 1000
+            spec = shared["spec"]
+            # Results were built by this node, so skip re-validating every field
+            run = TestRun.model_construct(
+                session_id=self.audit_logger.session_id,
+                spec_name=Path(shared["spec_file"]).name,
+                server=spec.get("mcp_server") or (spec.get("mcp_servers") or ["unknown"])[0],
+                status="completed",
+                duration_ms=duration_ms,
+                results=[TestResult.model_construct(
+                    test_name=r["test_name"],
+                    tool=r["tool"],
+                    arguments=r["arguments"],
+                    response=r["response"],
+                    status=r["status"],
+                    latency_ms=float(r["metrics"].get("latency_ms", 0.0)),  # ✅ FIXED: Extract from metrics
+                    mode=r["mode"],
+                    failures=r.get("failures", []),
+                    expected=r.get("expected", {})
+                ) for r in results]
+            )
+            # Run history lives in the JSON registry; MockRegistry only holds mocks
+            get_shared_registry().save_run(run)
+        except Exception as e:
+            logger.warning(f"Could not save run history: {e}")
+        
+        return "report"
+
+
+class GenerateReportNode(AuditedAsyncNode):
+    """Pretty + JSON reports (with mock/replay indicators)"""
+
+    async def prep_async(self, shared): 
+        return shared["results"]
+
+    async def exec_async(self, results):
+        # One pass: group rows and count passes per server
+        by_server = defaultdict(lambda: {"rows": [], "passed": 0})
+        for r in results:
+            group = by_server[r["server"]]
+            group["rows"].append(r)
+            group["passed"] += r["status"] == "PASS"
+
+        lines = ["="*70, "MCP TEST REPORT", "="*70]
+        for s, group in sorted(by_server.items()):
+            block = group["rows"]
+            lines += [f"\nServer: {s}", f"Summary: {group['passed']}/{len(block)} passed"]
+            for r in block:
+                icon = "✅" if r["status"] == "PASS" else "❌"
+                mode_badge = f"[{r.get('mode', 'real')}]"  # NEW: Show mode
+                lines.append(f"\n{icon} {r['test_name']} {mode_badge}  [{r['metrics'].get('latency_ms','?')} ms]")
+                if r["failures"]:
+                    for f in r["failures"]:
+                        lines.append(f"   - {f}")
+                lines.append(f"   Tool: {r['tool']}")
+                lines.append(f"   Args: {r['arguments']}")
+                preview = truncated_json(r['response'], 800)
+                lines.append(f"   Resp: {preview}")
+
+        await asyncio.to_thread(self._write_results, Path("results.json"), results)
+
+        return "\n".join(lines)
+
+    @staticmethod
+    def _write_results(path, results):
+        """Stream results to disk one record per line instead of serializing one big document"""
+        with open(path, "wb") as f:
+            f.write(b'{"results": [\n')
+            for i, r in enumerate(results):
+                if i:
+                    f.write(b",\n")
+                f.write(dumps_bytes(r))
+            f.write(b"\n]}\n")
+
+    async def post_async(self, shared, _, report):
+        logger.info("Test report generated")
+        shared["report"] = report
+        return "complete"
\ No newline at end of file
@@ -2,8 +2,56 @@ import re
 from typing import List, Tuple, Optional, Dict
 
 
+Connection = Tuple[str, Optional[str], str, Optional[List[str]]]
+
+
 class WorkflowParser:
-    """Parse >> syntax into workflow nodes and edges."""
+    """
+    Parse >> syntax into workflow nodes and edges.
+    
+    Construct with the workflow lines to parse once and query the precomputed
+    lookups; the static methods remain for one-off use on a connection list.
+    
+    Example:
+        parser = WorkflowParser(["scrape_url >> map_website[url]"])
+        parser.start_node               # "scrape_url"
+        parser.params_for("map_website")  # ["url"]
+    """
+    
+    # Pattern breakdown:
+    # (\w+) - source node
+    # (?:\[([^\]]+)\])? - optional source params [param1,param2]
+    # (?:\s*-\s*['\"](\w+)['\"])? - optional action
+    # \s*>>\s* - separator
+    # (\w+) - target node
+    # (?:\[([^\]]+)\])? - optional target params [param1,param2]
+    _CONN_RE = re.compile(
+        r"(\w+)(?:\[([^\]]+)\])?(?:\s*-\s*['\"](\w+)['\"])?\s*>>\s*(\w+)(?:\[([^\]]+)\])?"
+    )
+    
+    def __init__(self, workflow_lines: Optional[List[str]] = None):
+        self.connections: List[Connection] = []
+        self.node_order: List[str] = []
+        self.start_node: Optional[str] = None
+        self.params_by_target: Dict[str, List[str]] = {}
+        
+        if workflow_lines is not None:
+            self._index(self.parse_workflow(workflow_lines))
+    
+    def _index(self, connections: List[Connection]):
+        """Build every lookup in one pass over the connections"""
+        self.connections = connections
+        self.node_order = self.get_ordered_nodes(connections)
+        self.start_node = connections[0][0] if connections else None
+        
+        for _, _, target, params in connections:
+            # First declaration wins, matching get_node_params
+            if params and target not in self.params_by_target:
+                self.params_by_target[target] = params
+    
+    def params_for(self, node_name: str) -> Optional[List[str]]:
+        """Explicit parameters declared for a node, or None (precomputed get_node_params)"""
+        return self.params_by_target.get(node_name)
     
     @staticmethod
     def parse_workflow(workflow_lines: List[str]) -> List[Tuple[str, Optional[str], str, Optional[List[str]]]]:
@@ -35,17 +83,7 @@ class WorkflowParser:
                 continue
             
             # Match: "source[params] >> target[params]" or "source - 'action' >> target[params]"
-            # Pattern breakdown:
-            # (\w+) - source node
-            # (?:\[([^\]]+)\])? - optional source params [param1,param2]
-            # (?:\s*-\s*['\"](\w+)['\"])? - optional action
-            # \s*>>\s* - separator
-            # (\w+) - target node
-            # (?:\[([^\]]+)\])? - optional target params [param1,param2]
-            match = re.match(
-                r"(\w+)(?:\[([^\]]+)\])?(?:\s*-\s*['\"](\w+)['\"])?\s*>>\s*(\w+)(?:\[([^\]]+)\])?", 
-                line
-            )
+            match = WorkflowParser._CONN_RE.match(line)
             
             if match:
                 source = match.group(1)
@@ -1,16 +1,145 @@
+import copy
 import json
 import hashlib
+import heapq
+import os
+import secrets
+import sqlite3
+from collections import OrderedDict
+from collections.abc import MutableMapping
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from functools import lru_cache
+from itertools import islice
 from pathlib import Path
-from typing import Optional, Dict, Any, List
+from typing import Optional, Dict, Any, Iterator, List
 
 from .models import Mock, TestRun, Capabilities
+from .json_utils import loads as json_loads
+
+# Canonical args text shared by index keys and filename hashes; one encoder
+# instance avoids json.dumps building a new one per call for sort_keys
+_ARGS_ENCODER = json.JSONEncoder(sort_keys=True)
+
+
+@lru_cache(maxsize=1024)
+def _args_digest(canon: str) -> str:
+    """Filename hash for a canonical args string; repeated args ({}, {"limit": 10}) hash once"""
+    return hashlib.md5(canon.encode()).hexdigest()[:8]
+
+# File reads release the GIL, so a few threads per core overlap disk latency
+_READ_WORKERS = min(32, (os.cpu_count() or 1) * 4)
+
+
+def _read_file(path: str) -> Optional[bytes]:
+    """Read a file's bytes, or None if it cannot be read"""
+    try:
+        with open(path, "rb") as f:
+            return f.read()
+    except OSError:
+        return None
+
+
+def _read_files(paths: List[str]) -> List[Optional[bytes]]:
+    """Read several files concurrently, in order; unreadable files come back as None"""
+    if len(paths) < 2:
+        return [_read_file(path) for path in paths]
+    with ThreadPoolExecutor(max_workers=min(len(paths), _READ_WORKERS)) as pool:
+        return list(pool.map(_read_file, paths))
+
+
+class MockIndex(MutableMapping):
+    """
+    Mock key -> relative file path, stored in SQLite.
+    
+    Behaves like the dict the index.json file used to hold, but each save is a
+    single-row upsert instead of a rewrite of the whole index.
+    """
+    
+    def __init__(self, db_path: Path):
+        self.db_path = db_path
+        # Autocommit; transaction() groups bulk writes
+        self._db = sqlite3.connect(str(db_path), isolation_level=None, check_same_thread=False)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS mocks ("
+            "key TEXT PRIMARY KEY, path TEXT NOT NULL, category TEXT NOT NULL"
+            ") WITHOUT ROWID"
+        )
+        self._depth = 0
+    
+    def __getitem__(self, key: str) -> str:
+        row = self._db.execute("SELECT path FROM mocks WHERE key = ?", (key,)).fetchone()
+        if row is None:
+            raise KeyError(key)
+        return row[0]
+    
+    def __setitem__(self, key: str, path: str):
+        # Keys are "{category}:{tool}:{args}"
+        self._db.execute(
+            "INSERT OR REPLACE INTO mocks (key, path, category) VALUES (?, ?, ?)",
+            (key, path, key.split(":", 1)[0]),
+        )
+    
+    def __delitem__(self, key: str):
+        if self._db.execute("DELETE FROM mocks WHERE key = ?", (key,)).rowcount == 0:
+            raise KeyError(key)
+    
+    def __contains__(self, key: object) -> bool:
+        return self._db.execute("SELECT 1 FROM mocks WHERE key = ?", (key,)).fetchone() is not None
+    
+    def __iter__(self) -> Iterator[str]:
+        return (row[0] for row in self._db.execute("SELECT key FROM mocks").fetchall())
+    
+    def __len__(self) -> int:
+        return self._db.execute("SELECT COUNT(*) FROM mocks").fetchone()[0]
+    
+    def clear(self, category: Optional[str] = None):
+        """Remove every entry, or only those in one category"""
+        if category is None:
+            self._db.execute("DELETE FROM mocks")
+        else:
+            self._db.execute("DELETE FROM mocks WHERE category = ?", (category,))
+    
+    def update_many(self, entries: Dict[str, str]):
+        """Upsert many entries in one transaction"""
+        with self.transaction():
+            for key, path in entries.items():
+                self[key] = path
+    
+    @contextmanager
+    def transaction(self):
+        """Group writes into one transaction (nested calls join the outermost)"""
+        if self._depth == 0:
+            self._db.execute("BEGIN")
+        self._depth += 1
+        try:
+            yield self
+        except BaseException:
+            self._depth -= 1
+            if self._depth == 0:
+                self._db.execute("ROLLBACK")
+            raise
+        else:
+            self._depth -= 1
+            if self._depth == 0:
+                self._db.execute("COMMIT")
+    
+    def close(self):
+        self._db.close()
 
 
 class JsonRegistry:
     """JSON-based registry for mocks, runs, and capabilities"""
     
-    def __init__(self, data_dir: str = "data"):
+    # Parsed mock responses kept in memory (least recently used evicted first)
+    MOCK_CACHE_SIZE = 1024
+    
+    def __init__(self, data_dir: str = "data", pretty: bool = False):
         self.data_dir = Path(data_dir)
+        # Compact JSON by default; pretty=True indents files for hand inspection
+        self._indent = 2 if pretty else None
         self.runs_dir = self.data_dir / "runs"
         self.mocks_dir = self.data_dir / "mocks"
         self.capabilities_dir = self.data_dir / "capabilities"
@@ -22,8 +151,15 @@ class JsonRegistry:
                          self.capabilities_dir]:
             dir_path.mkdir(parents=True, exist_ok=True)
         
-        self.index_file = self.mocks_dir / "index.json"
-        self.index = self._load_index()
+        self.index_file = self.mocks_dir / "index.json"  # Pre-SQLite index, migrated once
+        self.index = MockIndex(self.mocks_dir / "index.db")
+        self._migrate_json_index()
+        
+        # index key -> parsed response, so repeated replays skip the file read
+        self._mock_cache: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        
+        # get_stats() result, reused while the watched directories' mtimes are unchanged
+        self._stats_cache: Optional[tuple] = None
         
         self._migrate_legacy_if_needed()
     
@@ -53,34 +189,78 @@ class JsonRegistry:
             response=response
         )
         
-        args_hash = self._hash_args(args)
+        canon = self._canon_args(args)
+        args_hash = self._hash_args(args, canon)
         filename = f"{tool}_{args_hash}.json"
         
         file_path = self.mocks_dir / category / filename
-        file_path.write_text(json.dumps(mock.model_dump(), indent=2, default=str, ensure_ascii=False))
+        file_path.write_bytes(mock.model_dump_json(indent=self._indent).encode())
         
-        key = self._get_mock_key(category, tool, args)
+        key = self._get_mock_key(category, tool, args, canon)
         self.index[key] = str(file_path.relative_to(self.data_dir))
-        self._save_index()
+        # A copy, so later changes to the caller's dict don't leak into replays
+        self._cache_mock(key, copy.deepcopy(response))
         
         print(f"📁 Saved to {file_path}")
     
     def load_mock(self, category: str, tool: str, args: Dict[str, Any]) -> Optional[Dict[str, Any]]:
-        """Load mock from organized directory"""
+        """Load mock from organized directory (a fresh copy the caller may modify)"""
         key = self._get_mock_key(category, tool, args)
         
-        if key not in self.index:
+        # The index row and the file are checked even on a cache hit, so a mock
+        # deleted outside this process stops replaying
+        rel_path = self.index.get(key)
+        if rel_path is None:
+            self._mock_cache.pop(key, None)
             return None
         
-        file_path = self.data_dir / self.index[key]
+        file_path = self.data_dir / rel_path
         if not file_path.exists():
+            self._mock_cache.pop(key, None)
             return None
         
+        cached = self._mock_cache.get(key)
+        if cached is not None:
+            self._mock_cache.move_to_end(key)
+            return copy.deepcopy(cached)
+        
         try:
-            mock_data = json.loads(file_path.read_text())
-            return mock_data.get("response")
+            mock_data = json_loads(file_path.read_bytes())
+            response = mock_data.get("response")
         except:
             return None
+        
+        if response is not None:
+            self._cache_mock(key, copy.deepcopy(response))
+        return response
+    
+    def _cache_mock(self, key: str, response: Dict[str, Any]):
+        """Remember a parsed response, evicting the least recently used past MOCK_CACHE_SIZE"""
+        self._mock_cache[key] = response
+        self._mock_cache.move_to_end(key)
+        if len(self._mock_cache) > self.MOCK_CACHE_SIZE:
+            self._mock_cache.popitem(last=False)
+    
+    def flush(self):
+        """Kept for API compatibility: index writes are committed as they happen"""
+    
+    @contextmanager
+    def batch(self):
+        """
+        Commit the index writes of many saves in a single transaction.
+        
+        Usage:
+            with registry.batch():
+                for tool, args, resp in recordings:
+                    registry.save_mock("tools", tool, args, resp)
+        """
+        try:
+            with self.index.transaction():
+                yield self
+        except BaseException:
+            # Responses cached by the rolled-back saves are no longer indexed
+            self._mock_cache.clear()
+            raise
     
     def has_mock_in_category(self, category: str, tool: str, args: Dict[str, Any]) -> bool:
         """Check if mock exists"""
@@ -88,40 +268,35 @@ class JsonRegistry:
         return key in self.index
     
     def list_mocks(self, category: Optional[str] = None) -> List[Mock]:
-        """List all mocks, optionally filtered by category"""
-        mocks = []
-        
+        """List all mocks, optionally filtered by category (files are read concurrently)"""
         categories = [category] if category else ["tools", "resources", "prompts"]
+        paths = [entry.path for cat in categories for entry in self._scan_json(self.mocks_dir / cat)]
         
-        for cat in categories:
-            cat_dir = self.mocks_dir / cat
-            if not cat_dir.exists():
+        mocks = []
+        for data in _read_files(paths):
+            if data is None:
+                continue
+            try:
+                mocks.append(Mock.model_validate_json(data))
+            except ValueError:
                 continue
-            for mock_file in cat_dir.glob("*.json"):
-                try:
-                    data = json.loads(mock_file.read_text())
-                    mocks.append(Mock(**data))
-                except:
-                    pass
-        
         return mocks
     
+    def count_category(self, category: str) -> int:
+        """Count mock files in one category without reading them"""
+        return len(self._scan_json(self.mocks_dir / category))
+    
     def clear_mocks(self, category: Optional[str] = None):
         """Clear mocks, optionally filtered by category"""
-        if category:
-            cat_dir = self.mocks_dir / category
-            if cat_dir.exists():
-                for mock_file in cat_dir.glob("*.json"):
-                    mock_file.unlink()
-        else:
-            for cat in ["tools", "resources", "prompts"]:
-                cat_dir = self.mocks_dir / cat
-                if cat_dir.exists():
-                    for mock_file in cat_dir.glob("*.json"):
-                        mock_file.unlink()
+        categories = [category] if category else ["tools", "resources", "prompts"]
         
-        self.index = {}
-        self._save_index()
+        for cat in categories:
+            for entry in self._scan_json(self.mocks_dir / cat):
+                os.unlink(entry.path)
+        
+        self.index.clear(category)
+        self._mock_cache.clear()
+        self._stats_cache = None
     
     # ============================================================
     # RUN OPERATIONS
@@ -133,15 +308,31 @@ class JsonRegistry:
         filename = f"{timestamp}_{run.spec_name.replace('.yaml', '').replace('/', '_')}.json"
         
         file_path = self.runs_dir / filename
-        file_path.write_text(json.dumps(run.model_dump(), indent=2, default=str, ensure_ascii=False))
+        data = run.model_dump_json(indent=self._indent).encode()
+        file_path.write_bytes(data)
         
+        # Build the new pointer beside latest.json and swap it in atomically, so
+        # readers never see latest.json missing; without symlink support
+        # (e.g. Windows without the privilege) the pointer is a copy of the run
         latest = self.runs_dir / "latest.json"
+        # Unique per save, so concurrent saves never share (or follow) one temp path
+        tmp = self.runs_dir / f".latest.json.{secrets.token_hex(8)}.tmp"
         try:
-            if latest.exists():
-                latest.unlink()
-            latest.symlink_to(filename)
-        except (OSError, NotImplementedError):
-            latest.write_text(file_path.read_text())
+            try:
+                os.symlink(filename, tmp)
+            except FileExistsError:
+                raise
+            except (OSError, NotImplementedError):
+                # "x" refuses to open through anything already at the temp path
+                with open(tmp, "xb") as f:
+                    f.write(data)
+            os.replace(tmp, latest)
+        except BaseException:
+            try:
+                os.unlink(tmp)
+            except OSError:
+                pass
+            raise
         
         print(f"💾 Run saved to {file_path}")
     
@@ -152,29 +343,36 @@ class JsonRegistry:
             return None
         
         try:
-            data = json.loads(latest.read_text())
-            return TestRun(**data)
+            return TestRun.model_validate_json(latest.read_bytes())
         except:
             return None
     
     def list_runs(self, limit: int = 10) -> List[TestRun]:
         """List recent runs"""
-        run_files = sorted(self.runs_dir.glob("*.json"), reverse=True)
-        runs = []
+        paths = self._newest_run_paths(limit)
         
-        for file in run_files:
-            if file.name == "latest.json":
-                continue
+        # The newest `limit` files are read concurrently; older files are only
+        # read, one at a time, to stand in for ones that failed to load
+        runs = [run for run in map(self._parse_run, _read_files(list(islice(paths, limit)))) if run]
+        for path in paths:
             if len(runs) >= limit:
                 break
-            try:
-                data = json.loads(file.read_text())
-                runs.append(TestRun(**data))
-            except:
-                pass
+            run = self._parse_run(_read_file(path))
+            if run:
+                runs.append(run)
         
         return runs
     
+    @staticmethod
+    def _parse_run(data: Optional[bytes]) -> Optional[TestRun]:
+        """Validate a run file's bytes, or None if missing or malformed"""
+        if data is None:
+            return None
+        try:
+            return TestRun.model_validate_json(data)
+        except ValueError:
+            return None
+    
     # ============================================================
     # CAPABILITIES OPERATIONS
     # ============================================================
@@ -182,7 +380,8 @@ class JsonRegistry:
     def save_capabilities(self, capabilities: Capabilities):
         """Save server capabilities manifest"""
         file_path = self.capabilities_dir / "manifest.json"
-        file_path.write_text(json.dumps(capabilities.model_dump(), indent=2, default=str, ensure_ascii=False))
+        file_path.write_bytes(capabilities.model_dump_json(indent=self._indent).encode())
+        self._stats_cache = None
         print(f"📋 Capabilities saved to {file_path}")
     
     def load_capabilities(self) -> Optional[Capabilities]:
@@ -192,8 +391,7 @@ class JsonRegistry:
             return None
         
         try:
-            data = json.loads(file_path.read_text())
-            return Capabilities(**data)
+            return Capabilities.model_validate_json(file_path.read_bytes())
         except:
             return None
     
@@ -201,28 +399,57 @@ class JsonRegistry:
     # UTILITIES
     # ============================================================
     
-    def _get_mock_key(self, category: str, tool: str, args: Dict[str, Any]) -> str:
-        """Generate unique key for mock lookup"""
-        args_json = json.dumps(args, sort_keys=True)
+    @staticmethod
+    def _scan_json(directory: Path) -> List[os.DirEntry]:
+        """List a directory's *.json files via os.scandir (no Path object per entry)"""
+        try:
+            with os.scandir(directory) as entries:
+                return [
+                    entry for entry in entries
+                    if entry.name.endswith(".json") and not entry.name.startswith(".") and entry.is_file()
+                ]
+        except FileNotFoundError:
+            return []
+    
+    def _run_file_paths(self) -> List[str]:
+        """Paths of saved run files (excluding the latest.json pointer)"""
+        return [entry.path for entry in self._scan_json(self.runs_dir) if entry.name != "latest.json"]
+    
+    def _newest_run_paths(self, limit: int) -> Iterator[str]:
+        """Run file paths newest first (names start with the timestamp); only the top `limit` are sorted up front"""
+        paths = self._run_file_paths()
+        yield from heapq.nlargest(limit, paths)
+        # Only reached when some of the newest files could not be loaded
+        if len(paths) > limit:
+            yield from sorted(paths, reverse=True)[limit:]
+    
+    @staticmethod
+    def _canon_args(args: Dict[str, Any]) -> str:
+        """Serialize args once in the sort_keys form stored in index keys"""
+        return _ARGS_ENCODER.encode(args)
+    
+    def _get_mock_key(self, category: str, tool: str, args: Dict[str, Any],
+                      canon: Optional[str] = None) -> str:
+        """Generate unique key for mock lookup (pass `canon` to reuse a serialization)"""
+        args_json = self._canon_args(args) if canon is None else canon
         return f"{category}:{tool}:{args_json}"
     
-    def _hash_args(self, args: Dict[str, Any]) -> str:
-        """Generate short hash of arguments"""
-        args_json = json.dumps(args, sort_keys=True)
-        return hashlib.md5(args_json.encode()).hexdigest()[:8]
+    def _hash_args(self, args: Dict[str, Any], canon: Optional[str] = None) -> str:
+        """Generate short hash of arguments (pass `canon` to reuse a serialization)"""
+        args_json = self._canon_args(args) if canon is None else canon
+        return _args_digest(args_json)
     
-    def _load_index(self) -> Dict[str, str]:
-        """Load mock index for fast lookups"""
+    def _migrate_json_index(self):
+        """One-shot import of a pre-SQLite index.json into the index database"""
         if not self.index_file.exists():
-            return {}
+            return
         try:
-            return json.loads(self.index_file.read_text())
-        except:
-            return {}
-    
-    def _save_index(self):
-        """Save mock index"""
-        self.index_file.write_text(json.dumps(self.index, indent=2, ensure_ascii=False))
+            entries = json_loads(self.index_file.read_bytes())
+        except Exception:
+            entries = {}
+        if isinstance(entries, dict):
+            self.index.update_many(entries)
+        self.index_file.rename(self.index_file.with_name("index.json.old"))
     
     def _migrate_legacy_if_needed(self):
         """Migrate from old mocks.json if it exists"""
@@ -233,36 +460,47 @@ class JsonRegistry:
         print("🔄 Migrating from legacy mocks.json...")
         
         try:
-            legacy_data = json.loads(legacy_file.read_text())
+            legacy_data = json_loads(legacy_file.read_bytes())
             
             migrated = 0
-            for key, response in legacy_data.items():
-                try:
-                    data = json.loads(key)
-                    tool = data.get("tool", "unknown")
-                    args = data.get("args", {})
-                    
-                    self.save_mock("tools", tool, args, response)
-                    migrated += 1
-                except Exception as e:
-                    print(f"⚠️  Skipped invalid entry: {str(e)[:50]}...")
+            with self.batch():
+                for key, response in legacy_data.items():
+                    try:
+                        data = json_loads(key)
+                        tool = data.get("tool", "unknown")
+                        args = data.get("args", {})
+                        
+                        self.save_mock("tools", tool, args, response)
+                        migrated += 1
+                    except Exception as e:
+                        print(f"⚠️  Skipped invalid entry: {str(e)[:50]}...")
             
             legacy_file.rename("mocks.json.old")
             print(f"✅ Migrated {migrated} mocks! Old file renamed to mocks.json.old")
         except Exception as e:
             print(f"❌ Migration failed: {e}")
     
+    def _stats_key(self) -> tuple:
+        """mtime_ns of every directory get_stats() scans (adding/removing files bumps them)"""
+        dirs = [self.mocks_dir / "tools", self.mocks_dir / "resources", self.mocks_dir / "prompts", self.runs_dir]
+        return tuple(d.stat().st_mtime_ns if d.exists() else None for d in dirs) + (len(self.index),)
+    
     def get_stats(self) -> Dict[str, Any]:
-        """Get registry statistics"""
+        """Get registry statistics (cached until the mock/run directories change)"""
+        key = self._stats_key()
+        if self._stats_cache is not None and self._stats_cache[0] == key:
+            return dict(self._stats_cache[1])
+        
         stats = {
             "total_mocks": len(self.index),
-            "tools": len(list((self.mocks_dir / "tools").glob("*.json"))) if (self.mocks_dir / "tools").exists() else 0,
-            "resources": len(list((self.mocks_dir / "resources").glob("*.json"))) if (self.mocks_dir / "resources").exists() else 0,
-            "prompts": len(list((self.mocks_dir / "prompts").glob("*.json"))) if (self.mocks_dir / "prompts").exists() else 0,
-            "total_runs": len([f for f in self.runs_dir.glob("*.json") if f.name != "latest.json"]) if self.runs_dir.exists() else 0,
+            "tools": self.count_category("tools"),
+            "resources": self.count_category("resources"),
+            "prompts": self.count_category("prompts"),
+            "total_runs": len(self._run_file_paths()),
             "data_dir": str(self.data_dir.absolute())
         }
-        return stats
+        self._stats_cache = (key, stats)
+        return dict(stats)
 
 
 # ============================================================
@@ -2,6 +2,8 @@
 Retry logic and error handling utilities for MCP calls.
 """
 import asyncio
+import copy
+import random
 import time
 from typing import Any, Callable, Optional, Type, Union, List
 from functools import wraps
@@ -31,7 +33,7 @@ class RetryConfig:
 
 def is_retryable_exception(exception: Exception, retryable_types: List[Type[Exception]]) -> bool:
     """Check if an exception is retryable"""
-    return any(isinstance(exception, exc_type) for exc_type in retryable_types)
+    return isinstance(exception, tuple(retryable_types))
 
 def calculate_delay(attempt: int, config: RetryConfig) -> float:
     """Calculate delay for retry attempt"""
@@ -40,7 +42,6 @@ def calculate_delay(attempt: int, config: RetryConfig) -> float:
     
     if config.jitter:
         # Add random jitter to prevent thundering herd
-        import random
         jitter_factor = random.uniform(0.5, 1.5)
         delay *= jitter_factor
     
@@ -71,19 +72,23 @@ async def retry_async(
         config = RetryConfig()
     
     last_exception = None
+    # Resolved once per call: isinstance() checks a tuple of types in C, and a
+    # shared config's retryable_exceptions may be reassigned between calls
+    retryable_types = tuple(config.retryable_exceptions)
+    max_attempts = config.max_attempts
     
-    for attempt in range(1, config.max_attempts + 1):
+    for attempt in range(1, max_attempts + 1):
         try:
             return await func(*args, **kwargs)
         except Exception as e:
             last_exception = e
             
             # Check if this exception is retryable
-            if not is_retryable_exception(e, config.retryable_exceptions):
+            if not isinstance(e, retryable_types):
                 raise e
             
             # If this was the last attempt, raise the exception
-            if attempt == config.max_attempts:
+            if attempt == max_attempts:
                 raise e
             
             # Calculate delay and wait
@@ -107,13 +112,16 @@ def retryable(
     Returns:
         Decorated function
     """
+    # Resolved once at decoration time rather than on every call; a shared
+    # config (e.g. STANDARD_RETRY) is copied before its exceptions are overridden
+    retry_config = config or RetryConfig()
+    if retryable_exceptions:
+        retry_config = copy.copy(retry_config)
+        retry_config.retryable_exceptions = retryable_exceptions
+    
     def decorator(func: Callable) -> Callable:
         @wraps(func)
         async def wrapper(*args, **kwargs):
-            retry_config = config or RetryConfig()
-            if retryable_exceptions:
-                retry_config.retryable_exceptions = retryable_exceptions
-            
             return await retry_async(func, *args, config=retry_config, **kwargs)
         return wrapper
     return decorator
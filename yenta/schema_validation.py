@@ -4,6 +4,7 @@ YAML schema validation for Yenta spec files.
 from typing import Dict, Any, List, Optional
 from pydantic import BaseModel, Field, ValidationError
 from pathlib import Path
+from yenta.yaml_utils import yaml_load_file
 
 class TestCase(BaseModel):
     """Individual test case schema"""
@@ -26,6 +27,7 @@ class SpecSchema(BaseModel):
     custom_tests: List[TestCase] = Field(..., description="List of test cases to run")
     use_mocks: bool = Field(default=False, description="Global mock usage setting")
     record_mocks: bool = Field(default=False, description="Global mock recording setting")
+    max_concurrent: int = Field(default=16, ge=1, description="Maximum number of tests run concurrently")
     
     def model_post_init(self, __context) -> None:
         """Validate that either mcp_server or mcp_servers is provided"""
@@ -63,6 +65,18 @@ def validate_spec(spec_data: Dict[str, Any]) -> SpecSchema:
             e.model
         )
 
+def load_spec_file(spec_file: Path) -> Dict[str, Any]:
+    """
+    Parse a spec file into a raw dict without validating it.
+    
+    Args:
+        spec_file: Path to spec file
+        
+    Returns:
+        Raw spec data from YAML
+    """
+    return yaml_load_file(spec_file)
+
 def validate_spec_file(spec_file: Path) -> SpecSchema:
     """
     Validate a spec file.
@@ -80,8 +94,4 @@ def validate_spec_file(spec_file: Path) -> SpecSchema:
     if not spec_file.exists():
         raise FileNotFoundError(f"Spec file not found: {spec_file}")
     
-    import yaml
-    with open(spec_file) as f:
-        spec_data = yaml.safe_load(f)
-    
-    return validate_spec(spec_data)
+    return validate_spec(load_spec_file(spec_file))
@@ -1,9 +1,23 @@
-from typing import Dict, Type
-from pydantic import BaseModel
+from typing import Dict, Optional, Type
+from pydantic import BaseModel, TypeAdapter
 
 # Registry of validation schemas
 SCHEMA_REGISTRY: Dict[str, Type[BaseModel]] = {}
 
+# Validators built once per registered model
+_VALIDATORS: Dict[Type[BaseModel], TypeAdapter] = {}
+
+
+def get_validator(schema_name: str) -> Optional[TypeAdapter]:
+    """Get the cached validator for a registered schema, or None if unknown"""
+    model = SCHEMA_REGISTRY.get(schema_name)
+    if model is None:
+        return None
+    validator = _VALIDATORS.get(model)
+    if validator is None:
+        validator = _VALIDATORS[model] = TypeAdapter(model)
+    return validator
+
 
 class ExpectedTask(BaseModel):
     title: str
@@ -13,4 +27,4 @@ class ExpectedTask(BaseModel):
 
 
 # Register schema
-SCHEMA_REGISTRY["ExpectedTask"] = ExpectedTask
\ No newline at end of file
+SCHEMA_REGISTRY["ExpectedTask"] = ExpectedTask
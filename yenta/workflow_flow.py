@@ -17,6 +17,7 @@ import inspect
 from agora.telemetry import AuditedAsyncFlow, AuditLogger
 from yenta.workflow_nodes import MCPNode
 from yenta.parser import WorkflowParser
+from yenta._scheduler import build_dependencies, needs_layered_run, run_layers
 
 
 class MCPWorkflowFlow(AuditedAsyncFlow):
@@ -48,6 +49,14 @@ class MCPWorkflowFlow(AuditedAsyncFlow):
           - scrape_url >> extract_links[content]           # Only content
           - scrape_url >> process_page[url, title, content] # Multiple params
     
+    PARALLEL BRANCHES:
+    ------------------
+    Unconditional workflows that fan out run each readiness layer concurrently:
+    
+        workflow:
+          - scrape_url >> extract_links
+          - scrape_url >> summarize       # Runs alongside extract_links
+    
     CUSTOM NODES:
     -------------
     Mix MCP tools with custom Python logic:
@@ -85,6 +94,7 @@ class MCPWorkflowFlow(AuditedAsyncFlow):
         self.custom_nodes_file = custom_nodes_file
         self.nodes: Dict[str, Any] = {}
         self.start_node_name = None
+        self.dependencies: Optional[Dict[str, List[str]]] = None  # Set for layered runs
         
         # Load custom nodes if provided
         self.custom_node_classes = {}
@@ -159,14 +169,14 @@ class MCPWorkflowFlow(AuditedAsyncFlow):
            - Explicit params if specified: tool[param1,param2]
            - Auto-mapping otherwise: discovers and matches params automatically
         """
-        parser = WorkflowParser()
-        connections = parser.parse_workflow(self.workflow_spec)
+        parser = WorkflowParser(self.workflow_spec)
+        connections = parser.connections
         
         if not connections:
             raise ValueError("No valid workflow connections found")
         
-        ordered_nodes = parser.get_ordered_nodes(connections)
-        self.start_node_name = parser.get_start_node(connections)
+        ordered_nodes = parser.node_order
+        self.start_node_name = parser.start_node
         
         print(f"\n🔨 Building workflow with {len(ordered_nodes)} nodes:")
         print(f"   Mode: {'Explicit + Auto-mapping' if any(p for _, _, _, p in connections if p) else 'Auto-mapping'}")
@@ -176,7 +186,7 @@ class MCPWorkflowFlow(AuditedAsyncFlow):
             next_node = ordered_nodes[i + 1] if i < len(ordered_nodes) - 1 else "complete"
             
             # Get explicit params if specified (e.g., tool[url,limit])
-            explicit_params = parser.get_node_params(connections, node_name)
+            explicit_params = parser.params_for(node_name)
             
             # Decision: Custom node or MCP tool?
             if self._is_custom_node(node_name):
@@ -209,7 +219,7 @@ class MCPWorkflowFlow(AuditedAsyncFlow):
             
             self.nodes[node_name] = node
         
-        # Wire nodes using Agora's >> operator
+        # Wire nodes using Agora's >> operator (also what to_mermaid() draws)
         print(f"\n🔗 Wiring {len(connections)} connections:")
         for source_name, action, target_name, _ in connections:
             source_node = self.nodes[source_name]
@@ -227,6 +237,13 @@ class MCPWorkflowFlow(AuditedAsyncFlow):
                 source_node >> target_node
         
         self.start(self.nodes[self.start_node_name])
+        
+        # Independent branches: Agora follows one successor per node, so these
+        # workflows are orchestrated by dependency layer instead (see _orch_async)
+        if needs_layered_run(connections):
+            self.dependencies = build_dependencies(connections)
+            print("\n⚡ Parallel branches: nodes will run in dependency layers")
+        
         print(f"\n Workflow built! Starting at: {self.start_node_name}")
         print(f"   Parameters will be {'explicitly filtered or auto-mapped' if any(self.nodes[n].explicit_params for n in self.nodes if hasattr(self.nodes[n], 'explicit_params')) else 'auto-mapped'}\n")
     
@@ -235,13 +252,32 @@ class MCPWorkflowFlow(AuditedAsyncFlow):
         if shared is None:
             shared = {}
         
+        if self.dependencies is not None:
+            # Every root node gets the initial input
+            if self.initial_input:
+                for node_name, preds in self.dependencies.items():
+                    if not preds:
+                        shared[f"{node_name}_input"] = self.initial_input
+        
         # Set initial input for the START NODE
-        if self.initial_input and self.start_node_name:
+        elif self.initial_input and self.start_node_name:
             shared[f"{self.start_node_name}_input"] = self.initial_input
         
         await super().run_async(shared)
         
         return shared
+    
+    async def _orch_async(self, shared: Dict[str, Any], params: Optional[Dict[str, Any]] = None):
+        """
+        Orchestrate the nodes inside the audited flow run.
+        
+        Workflows with parallel branches run by dependency layer; everything
+        else follows Agora's successor routing. Either way each node run gets
+        the flow params (`params`, else the flow's own).
+        """
+        if self.dependencies is None:
+            return await super()._orch_async(shared, params)
+        await run_layers(self.nodes, self.dependencies, shared, params or {**self.params})
 
 
 # Backward compatibility
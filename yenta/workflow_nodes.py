@@ -7,8 +7,10 @@ instead of wrapping it in {"result": ...}
 
 import asyncio
 import json
+import sys
 from typing import Any, Dict, Optional, List, Set
 from agora.telemetry import AuditedAsyncNode
+from yenta.json_utils import loads as json_loads
 
 try:
     from fastmcp import Client
@@ -17,6 +19,10 @@ except ImportError:
     FASTMCP_AVAILABLE = False
     Client = None
 
+# Shared-store key naming the output the next node should read; every node type
+# (MCP, custom, the layered scheduler) imports this one interned string
+PREV_OUTPUT_KEY = sys.intern("_prev_output_key")
+
 
 class MCPNode(AuditedAsyncNode):
     """Agora node that calls an MCP entity (tool/prompt/resource) with automatic parameter mapping."""
@@ -32,6 +38,8 @@ class MCPNode(AuditedAsyncNode):
         explicit_params: Optional[List[str]] = None  # User-specified params
     ):
         super().__init__(name, audit_logger)
+        self._input_key = sys.intern(f"{name}_input")
+        self._output_key = sys.intern(f"{name}_output")
         self.entity_type = entity_type
         self.entity_name = entity_name
         self.server_path = server_path
@@ -142,10 +150,10 @@ class MCPNode(AuditedAsyncNode):
         3. Pass everything if both fail (fallback)
         """
         # Get input from previous node
-        if f"{self.name}_input" in shared:
-            input_data = shared[f"{self.name}_input"]
+        if self._input_key in shared:
+            input_data = shared[self._input_key]
         else:
-            prev_output_key = shared.get("_prev_output_key")
+            prev_output_key = shared.get(PREV_OUTPUT_KEY)
             if prev_output_key:
                 prev_output = shared.get(prev_output_key, {})
                 
@@ -170,7 +178,7 @@ class MCPNode(AuditedAsyncNode):
                             
                             # 🔥 NEW: Try to parse as JSON first
                             try:
-                                parsed = json.loads(text)
+                                parsed = json_loads(text)
                                 # If it's a dict, use it directly (unwrapped)
                                 if isinstance(parsed, dict):
                                     input_data = parsed
@@ -253,9 +261,8 @@ class MCPNode(AuditedAsyncNode):
     async def post_async(self, shared: Dict[str, Any], _, result: Any) -> str:
         """Store RAW output and return routing key."""
         # Store result for next node - EXACTLY AS RECEIVED
-        output_key = f"{self.name}_output"
-        shared[output_key] = result
-        shared["_prev_output_key"] = output_key
+        shared[self._output_key] = result
+        shared[PREV_OUTPUT_KEY] = self._output_key
         
         # Return routing key for Agora
         # For default (no action) routing, return empty string
@@ -4,17 +4,20 @@ Workflow registry for managing reusable workflows.
 Allows users to define workflows in YAML or Python and reference them by name.
 """
 
-import yaml
 import importlib.util
 import inspect
+import os
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from typing import Dict, Any, Optional, Type, Callable, Union
 from dataclasses import dataclass
 
 from agora.telemetry import AuditedAsyncFlow, AuditLogger
+from yenta.yaml_utils import yaml_load_file
+from yenta._compat import DATACLASS_SLOTS
 
 
-@dataclass
+@dataclass(**DATACLASS_SLOTS)
 class WorkflowDefinition:
     """Metadata for a registered workflow"""
     name: str
@@ -57,6 +60,27 @@ class WorkflowRegistry:
     
     def __init__(self):
         self.workflows: Dict[str, WorkflowDefinition] = {}
+        # tag -> workflow names (dict used as an insertion-ordered set)
+        self._by_tag: Dict[str, Dict[str, None]] = {}
+    
+    def _add(self, workflow: WorkflowDefinition):
+        """Store a definition and index its tags, replacing any same-named workflow"""
+        self._unindex(workflow.name)
+        self.workflows[workflow.name] = workflow
+        for tag in workflow.tags:
+            self._by_tag.setdefault(tag, {})[workflow.name] = None
+    
+    def _unindex(self, name: str):
+        """Drop a workflow's entries from the tag index"""
+        existing = self.workflows.get(name)
+        if existing is None:
+            return
+        for tag in existing.tags:
+            names = self._by_tag.get(tag)
+            if names is not None:
+                names.pop(name, None)
+                if not names:
+                    del self._by_tag[tag]
     
     def register(
         self, 
@@ -75,14 +99,14 @@ class WorkflowRegistry:
                     # ... define nodes
         """
         def decorator(cls: Type[AuditedAsyncFlow]):
-            self.workflows[name] = WorkflowDefinition(
+            self._add(WorkflowDefinition(
                 name=name,
                 description=description or cls.__doc__,
                 workflow_type="python",
                 source=f"{cls.__module__}.{cls.__name__}",
                 flow_class=cls,
                 tags=tags or []
-            )
+            ))
             return cls
         return decorator
     
@@ -109,17 +133,16 @@ class WorkflowRegistry:
                 tags=["search", "rag"]
             )
         """
-        with open(filepath) as f:
-            spec = yaml.safe_load(f)
+        spec = yaml_load_file(filepath)
         
-        self.workflows[name] = WorkflowDefinition(
+        self._add(WorkflowDefinition(
             name=name,
             description=description or spec.get("description"),
             workflow_type="yaml",
             source=filepath,
             yaml_spec=spec,
             tags=tags or spec.get("tags", [])
-        )
+        ))
     
     def register_class(
         self,
@@ -138,14 +161,14 @@ class WorkflowRegistry:
                 "Does something"
             )
         """
-        self.workflows[name] = WorkflowDefinition(
+        self._add(WorkflowDefinition(
             name=name,
             description=description or flow_class.__doc__,
             workflow_type="python",
             source=f"{flow_class.__module__}.{flow_class.__name__}",
             flow_class=flow_class,
             tags=tags or []
-        )
+        ))
     
     def get(self, name: str) -> Optional[WorkflowDefinition]:
         """Get workflow definition by name"""
@@ -161,7 +184,7 @@ class WorkflowRegistry:
     
     def list_by_tag(self, tag: str) -> list[WorkflowDefinition]:
         """List workflows by tag"""
-        return [w for w in self.workflows.values() if tag in w.tags]
+        return [self.workflows[name] for name in self._by_tag.get(tag, ())]
     
     def create_instance(
         self, 
@@ -212,6 +235,7 @@ class WorkflowRegistry:
     def remove(self, name: str) -> bool:
         """Remove a workflow from registry"""
         if name in self.workflows:
+            self._unindex(name)
             del self.workflows[name]
             return True
         return False
@@ -282,12 +306,16 @@ def discover_yaml_workflows(directory: str) -> Dict[str, str]:
             registry.register_yaml(name, filepath)
     """
     workflows = {}
-    dir_path = Path(directory)
+    yaml_files = sorted(Path(directory).glob("*.yaml"))
     
-    for yaml_file in dir_path.glob("*.yaml"):
-        with open(yaml_file) as f:
-            spec = yaml.safe_load(f)
-        
+    # Overlap file reads/parses; unchanged files are served from the YAML parse cache
+    if len(yaml_files) > 1:
+        with ThreadPoolExecutor(max_workers=min(len(yaml_files), os.cpu_count() or 1)) as pool:
+            specs = list(pool.map(yaml_load_file, yaml_files))
+    else:
+        specs = [yaml_load_file(f) for f in yaml_files]
+    
+    for yaml_file, spec in zip(yaml_files, specs):
         workflow_name = spec.get("workflow_name", yaml_file.stem)
         workflows[workflow_name] = str(yaml_file)
     
@@ -0,0 +1,56 @@
+"""
+YAML helpers for Yenta.
+
+Uses the libyaml C loader/dumper when PyYAML was built with it and falls back
+to the pure-Python safe implementations.
+"""
+from pathlib import Path
+from typing import Any, IO, Optional, Union
+
+import yaml
+
+try:
+    from yaml import CSafeLoader as SafeLoader, CSafeDumper as SafeDumper
+    LIBYAML_AVAILABLE = True
+except ImportError:
+    from yaml import SafeLoader, SafeDumper
+    LIBYAML_AVAILABLE = False
+
+
+def yaml_load(stream: Union[str, bytes, IO]) -> Any:
+    """
+    Safely parse a YAML document.
+
+    Args:
+        stream: YAML text, bytes, or an open file (binary mode avoids a decode pass)
+
+    Returns:
+        Parsed document
+    """
+    return yaml.load(stream, Loader=SafeLoader)
+
+
+def yaml_dump(data: Any, stream: Optional[IO] = None, **kwargs) -> Optional[str]:
+    """
+    Safely serialize data to YAML.
+
+    Args:
+        data: Plain Python data (dicts, lists, scalars)
+        stream: Optional file to write to; the YAML text is returned when omitted
+        **kwargs: Passed through to yaml.dump (e.g. default_flow_style)
+    """
+    return yaml.dump(data, stream, Dumper=SafeDumper, **kwargs)
+
+
+def yaml_load_file(path: Union[str, Path]) -> Any:
+    """
+    Parse a YAML file.
+
+    Args:
+        path: Path to the YAML file
+
+    Returns:
+        Parsed document
+    """
+    with open(path, "rb") as f:
+        return yaml_load(f)